@@ -0,0 +1,121 @@
+"""
+Stabilizer Microbenchmark
+
+Per-frame time and transient memory of the Stabilizer hot path (CLAHE,
+optical-flow steadiness, feature re-seeding, eye history), comparing the
+original implementation (reproduced below) with the current one.
+
+Usage (from backend/):
+    python benchmarks/stabilizer_benchmark.py [--width 640] [--frames 300] [--reseed-every 5]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.video_service import Stabilizer
+
+
+class LegacyStabilizer:
+    """The pre-vectorization hot path: Python norm loop, gray.copy(), fresh mask, list history."""
+
+    def __init__(self):
+        reference = Stabilizer()
+        self.lk_params = reference.lk_params
+        self.feature_params = reference.feature_params
+        self.clahe = cv2.createCLAHE(clipLimit=2.5, tileGridSize=(8, 8))
+        self.prev_gray = None
+        self.p0 = None
+        self.eyes_history = []
+
+    def step(self, gray, face_roi, reseed):
+        gray = self.clahe.apply(gray)
+        if self.p0 is not None and self.prev_gray is not None:
+            p1, st, err = cv2.calcOpticalFlowPyrLK(self.prev_gray, gray, self.p0, None, **self.lk_params)
+            if p1 is not None and len(p1) > 5:
+                good_new = p1[st == 1]
+                good_old = self.p0[st == 1]
+                dists = []
+                for new, old in zip(good_new, good_old):
+                    dists.append(np.linalg.norm(new - old))
+                np.mean(dists) if dists else 0
+                self.p0 = good_new.reshape(-1, 1, 2)
+            else:
+                self.p0 = None
+        if self.p0 is None or reseed:
+            (x, y, w, h) = face_roi
+            mask = np.zeros_like(gray)
+            mask[y:y+h, x:x+w] = 255
+            self.p0 = cv2.goodFeaturesToTrack(gray, mask=mask, **self.feature_params)
+        self.prev_gray = gray.copy()
+        self.eyes_history.append(2)
+        if len(self.eyes_history) > 8:
+            self.eyes_history.pop(0)
+        sum(self.eyes_history) / len(self.eyes_history)
+
+
+class CurrentStabilizer:
+    def __init__(self):
+        self.stabilizer = Stabilizer()
+
+    def step(self, gray, face_roi, reseed):
+        stabilizer = self.stabilizer
+        gray = stabilizer.equalize(gray)
+        stabilizer.track_flow(gray)
+        stabilizer.update_features(gray, face_roi, reseed=reseed)
+        stabilizer.update_eyes_history(2)
+        stabilizer.get_average_eyes()
+
+
+def make_frames(width: int, count: int) -> list:
+    height = width * 3 // 4
+    rng = np.random.default_rng(0)
+    base = cv2.GaussianBlur(rng.integers(0, 255, (height + count, width + count), dtype=np.uint8), (5, 5), 0)
+    return [np.ascontiguousarray(base[i % 3:i % 3 + height, :width]) for i in range(count)]
+
+
+def measure(impl, frames: list, face_roi: tuple, reseed_every: int) -> tuple:
+    impl.step(frames[0], face_roi, True)  # Warm-up: allocate buffers, seed features
+    
+    elapsed = 0.0
+    peak_total = 0
+    tracemalloc.start()
+    for i, frame in enumerate(frames):
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        impl.step(frame, face_roi, i % reseed_every == 0)
+        elapsed += time.perf_counter() - start
+        peak_total += tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+    # tracemalloc overhead inflates both timings equally; compare them relative to each other
+    return elapsed / len(frames) * 1000, peak_total / len(frames) / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--reseed-every", type=int, default=5)
+    args = parser.parse_args()
+    
+    cv2.setNumThreads(1)
+    frames = make_frames(args.width, args.frames)
+    height = frames[0].shape[0]
+    face_roi = (args.width // 3, height // 4, args.width // 3, height // 2)
+    
+    print(f"{'implementation':<16}{'ms/frame':>10}{'KB alloc/frame':>16}")
+    for name, impl in (("legacy", LegacyStabilizer()), ("current", CurrentStabilizer())):
+        ms, kb = measure(impl, frames, face_roi, args.reseed_every)
+        print(f"{name:<16}{ms:>10.3f}{kb:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
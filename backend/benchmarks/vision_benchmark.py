@@ -0,0 +1,82 @@
+"""
+Vision Benchmark
+
+Measures process_video_frame throughput (frames per second on one core) for
+each detection profile at 480p, 720p and 1080p input.
+
+Usage (from backend/):
+    python benchmarks/vision_benchmark.py [--image face.jpg] [--frames 60] [--detect-interval 1]
+
+Without --image a synthetic textured frame is used; no face is found there, so
+both cascades run on every scan (the worst case). Pass a photo of a face to
+measure the tracked path with eye/smile passes.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.video_service import VISION_PROFILES, Stabilizer, process_video_frame
+
+RESOLUTIONS = {"480p": (640, 480), "720p": (1280, 720), "1080p": (1920, 1080)}
+
+
+def make_frames(image_path: str | None, size: tuple, count: int) -> list:
+    """JPEG-encoded frames at `size`, shifted by a pixel each so optical flow has motion to follow."""
+    width, height = size
+    if image_path:
+        base = cv2.imread(image_path, cv2.IMREAD_COLOR)
+        if base is None:
+            raise SystemExit(f"Could not read {image_path}")
+        base = cv2.resize(base, (width + count, height + count))
+    else:
+        # Soft blotches plus mild sensor noise, roughly like a room behind the candidate
+        rng = np.random.default_rng(0)
+        blotches = cv2.resize(rng.integers(0, 255, (9, 16, 3), dtype=np.uint8), (width + count, height + count),
+                              interpolation=cv2.INTER_CUBIC)
+        noise = rng.normal(0, 4, blotches.shape)
+        base = np.clip(blotches + noise, 0, 255).astype(np.uint8)
+    
+    frames = []
+    for i in range(count):
+        crop = np.ascontiguousarray(base[i:i + height, i:i + width])
+        frames.append(cv2.imencode(".jpg", crop, [cv2.IMWRITE_JPEG_QUALITY, 80])[1].tobytes())
+    return frames
+
+
+def run(profile: str, frames: list, detect_interval: int | None) -> float:
+    stabilizer = Stabilizer(profile)
+    if detect_interval:
+        stabilizer.detect_interval = detect_interval
+    process_video_frame(frames[0], stabilizer)  # Warm-up (cascade/CLAHE buffers)
+    
+    start = time.perf_counter()
+    for frame in frames:
+        process_video_frame(frame, stabilizer)
+    return len(frames) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--image", help="Face photo to use instead of a synthetic frame")
+    parser.add_argument("--frames", type=int, default=60)
+    parser.add_argument("--detect-interval", type=int, help="Override VISION_DETECT_INTERVAL")
+    args = parser.parse_args()
+    
+    cv2.setNumThreads(1)  # Per-core numbers
+    
+    print(f"{'profile':<12}" + "".join(f"{name:>10}" for name in RESOLUTIONS))
+    frames_by_res = {name: make_frames(args.image, size, args.frames) for name, size in RESOLUTIONS.items()}
+    for profile in VISION_PROFILES:
+        fps = [run(profile, frames_by_res[name], args.detect_interval) for name in RESOLUTIONS]
+        print(f"{profile:<12}" + "".join(f"{value:>10.1f}" for value in fps))
+
+
+if __name__ == "__main__":
+    main()
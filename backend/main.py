@@ -7,29 +7,33 @@ from config.database import init_db, close_db
 # from services.interview_services import InterviewService # Removed per user request
 from models.interview_schema import InterviewReport
 from services.pdf_service import extract_text_from_pdf, generate_interview_pdf
-from services.llm_service import get_ai_response, get_hint, evaluate_answer, generate_interview_feedback, generate_study_roadmap
-from services.tts_service import generate_audio
-from services.video_service import process_video_frame, Stabilizer
+from services.llm_service import INTERVIEWER_FALLBACK, get_ai_response, stream_ai_response, get_hint, generate_interview_feedback, generate_study_roadmap
+from services.tts_service import generate_audio_async, get_tts_metrics, prewarm_tts_cache, SentenceAudioPipeline
+from services.transcription_service import AudioTooLargeError, audio_filename, check_audio_size, transcribe, get_transcription_metrics
+from services.vision_executor import create_vision_executor, LatestFrameSlot, FrameRateMeter
 from services.resume_analyzer import analyze_resume, build_compact_summary
 from services.interview_planner import generate_interview_plan, generate_topic_plan
-from services.tts_service import generate_audio as generate_tts_audio # Rename to avoid conflict if needed
 from services.interview_state import InterviewState
 from services.report_generator import generate_report
-from services.logic_validator import validate_logic
+from services.answer_evaluator import evaluate_turn, get_evaluator_metrics
+from services.evaluation_queue import EVALUATION_DRAIN_TIMEOUT, EVALUATION_POLL_SECONDS, EvaluationQueue
 from services.speech_analyzer import analyze_speech_confidence
+from services.voice_activity import analyze_audio, voice_activity_cache
 from services.weakness_engine import calculate_weakness_scores, detect_repeated_patterns, classify_topics
+from services.session_store import create_session_store, new_session_data
+from services.video_metrics import VIDEO_METRICS_EXPORT_POINTS, as_metrics_store
+from services.session_analytics import TranscriptStats, build_analytics_response
+from typing import List, Dict, Optional
 import asyncio
+import secrets
 import threading
 import json
 import base64
 import time
 import traceback
-import os
-from openai import AsyncOpenAI
 from dotenv import load_dotenv
 
 load_dotenv()
-client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
 # Lifespan context manager with error handling
 @asynccontextmanager
@@ -45,8 +49,15 @@ async def lifespan(app: FastAPI):
         import traceback
         traceback.print_exc()
     
+    # Synthesize stock replies in the background so their first use is a cache hit
+    prewarm_task = asyncio.create_task(prewarm_tts_cache(TTS_PREWARM_PHRASES))
+    vision.start()
+    
     yield
     
+    prewarm_task.cancel()
+    vision.shutdown()
+    
     # Shutdown: Close database connections
     try:
         print("[...] Closing database connections...")
@@ -77,21 +88,29 @@ camera = None
 camera_lock = threading.Lock()
 camera_active = False
 
-session_data = {
-    "resume_text": "",           # Raw text (kept for hints)
-    "job_description": "",
-    "candidate_profile": None,   # Structured profile from resume_analyzer
-    "candidate_summary": "",     # Compact summary for LLM prompts
-    "interview_plan": None,      # Fixed plan from interview_planner
-    "interview_state": None,     # InterviewState tracker instance
-    "transcript": [],            # Stores {"role": "user"|"ai", "content": "..."}
-    "video_metrics": [],         # Stores {"timestamp": float, "focus": int, "emotion": int, "confidence": int}
-    "answer_scores": []          # Stores per-answer evaluation scores
-}
+# Per-candidate sessions, keyed by the session id issued at upload/topic start
+sessions = create_session_store()
+VIDEO_FLUSH_SECONDS = 2.0  # How often /ws/video persists metrics to a shared backend
+TURN_FIELDS = ("interview_state", "transcript", "answer_scores", "pending_evaluations")  # Held dirty from a turn's first read to its commit
+
+# Frame analysis runs in worker processes so it can't block the interview socket
+vision = create_vision_executor()
+
+# Stock replies that are spoken often enough to keep pre-synthesized
+AI_ERROR_REPLY = "I'm having trouble thinking of a response. Let's continue."
+TTS_PREWARM_PHRASES = [AI_ERROR_REPLY, INTERVIEWER_FALLBACK]
+
+async def get_session(session_id: Optional[str]):
+    """Resolve a request's session or fail with 404 if it is missing or expired."""
+    session = await sessions.resolve(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session not found or expired")
+    return session
 
 class HintRequest(BaseModel):
     question: str
     level: str = "medium"  # small, medium, or full
+    session_id: Optional[str] = None
 
 class TopicInterviewRequest(BaseModel):
     topic: str  # AI_ML, DSA, or WEB_DEV
@@ -108,50 +127,58 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "ok", "database": "connected"}
+    return {"status": "ok", "database": "connected", "sessions": sessions.stats(),
+            "tts": get_tts_metrics(), "transcribe": get_transcription_metrics(), "evaluator": get_evaluator_metrics(),
+            "vision": vision.stats()}
 
 @app.post("/get-hint")
 async def get_interview_hint(request: HintRequest):
-    if not session_data["resume_text"]:
-        return {"hint": "Please upload a resume first."}
+    session = await get_session(request.session_id)
+    session_data = session.data
+    # Serialize level selection per session so progressive levels can't be skipped.
+    # The level is claimed under the lock; the LLM call runs after releasing it, so
+    # the interview turn and queued evaluations never wait on a hint
+    async with session.lock:
+        if not session_data["resume_text"]:
+            return {"hint": "Please upload a resume first."}
     
-    state = session_data.get("interview_state")
-    q_index = state.total_questions_asked if state else 0
+        state = session_data.get("interview_state")
+        q_index = state.total_questions_asked if state else 0
     
-    # Feature 1: Progressive hint enforcement
-    if state:
-        available_level = state.get_available_hint_level(q_index)
-        if available_level is None:
-            return {
-                "hint": "You've used all hint levels for this question. Try your best!",
-                "level_used": "exhausted",
-                "available_level": None,
-                "topic": state.question_topics.get(q_index, "GENERAL")
-            }
-        # Use the progressive level instead of requested level
-        level = available_level
-    else:
-        level = request.level
+        # Feature 1: Progressive hint enforcement
+        if state:
+            available_level = state.get_available_hint_level(q_index)
+            if available_level is None:
+                return {
+                    "hint": "You've used all hint levels for this question. Try your best!",
+                    "level_used": "exhausted",
+                    "available_level": None,
+                    "topic": state.question_topics.get(q_index, "GENERAL")
+                }
+            # Use the progressive level instead of requested level
+            level = available_level
+        else:
+            level = request.level
     
-    # Feature 1: Detect question topic
-    # Use the topic from the interview state (which comes from the plan)
-    if state and q_index in state.question_topics:
-        topic = state.question_topics[q_index]
-    else:
-        topic = "General"
+        # Feature 1: Detect question topic
+        # Use the topic from the interview state (which comes from the plan)
+        if state and q_index in state.question_topics:
+            topic = state.question_topics[q_index]
+        else:
+            topic = "General"
     
-    if state:
-        state.question_topics[q_index] = topic
+        # Record hint usage
+        if state:
+            state.question_topics[q_index] = topic
+            state.record_hint_used(q_index, level)
+    
+        # Calculate next available level
+        next_level = state.get_available_hint_level(q_index) if state else None
     
     hint = await get_hint(request.question, session_data["resume_text"], 
                           session_data["job_description"], level, topic)
-    
-    # Record hint usage
     if state:
-        state.record_hint_used(q_index, level)
-    
-    # Calculate next available level
-    next_level = state.get_available_hint_level(q_index) if state else None
+        await sessions.commit(session, "interview_state")
     
     return {
         "hint": hint, 
@@ -164,11 +191,9 @@ async def get_interview_hint(request: HintRequest):
 async def upload_resume(file: UploadFile = File(...), job_description: str = Form(...)):
     pdf_bytes = await file.read()
     text = extract_text_from_pdf(pdf_bytes)
+    session_data = new_session_data()
     session_data["resume_text"] = text
     session_data["job_description"] = job_description
-    session_data["transcript"] = []
-    session_data["video_metrics"] = []
-    session_data["answer_scores"] = []
     
     # Structured resume analysis (runs once at upload)
     profile = await analyze_resume(text, job_description)
@@ -179,12 +204,14 @@ async def upload_resume(file: UploadFile = File(...), job_description: str = For
     plan = await generate_interview_plan(profile, job_description)
     session_data["interview_plan"] = plan
     session_data["interview_state"] = None  # Will be created at WebSocket connect
+    session = await sessions.create(session_data)
     
     print(f"[Resume Analyzer] Profile: {json.dumps(profile, indent=2)[:500]}")
     print(f"[Interview Planner] Plan: {json.dumps(plan, indent=2)[:500]}")
     
     return {
         "message": "Data processed successfully!",
+        "session_id": session.session_id,
         "profile_summary": session_data["candidate_summary"],
         "interview_plan": {
             "total_questions": plan.get("total_questions", 10),
@@ -202,21 +229,16 @@ async def start_topic_interview(request: TopicInterviewRequest):
     
     difficulty = request.difficulty if request.difficulty in ("easy", "medium", "hard") else "medium"
     
-    # Reset session for topic mode
-    session_data["resume_text"] = ""
-    session_data["job_description"] = ""
+    # Fresh session for topic mode
+    session_data = new_session_data()
     session_data["difficulty"] = difficulty
     session_data["interview_topic"] = request.topic
-    session_data["candidate_profile"] = None
-    session_data["candidate_summary"] = ""
-    session_data["transcript"] = []
-    session_data["video_metrics"] = []
-    session_data["answer_scores"] = []
     
     # Generate topic-specific plan (no LLM call needed)
     plan = generate_topic_plan(request.topic, difficulty)
     session_data["interview_plan"] = plan
     session_data["interview_state"] = None  # Will be created at WebSocket connect
+    session = await sessions.create(session_data)
     
     topic_labels = {"AI_ML": "AI / Machine Learning", "DSA": "Data Structures & Algorithms", "WEB_DEV": "Web Development"}
     
@@ -225,6 +247,7 @@ async def start_topic_interview(request: TopicInterviewRequest):
     
     return {
         "message": f"{topic_labels[request.topic]} interview ready!",
+        "session_id": session.session_id,
         "interview_plan": {
             "total_questions": plan.get("total_questions", 9),
             "categories": [c["name"] for c in plan.get("categories", [])],
@@ -236,39 +259,234 @@ async def start_topic_interview(request: TopicInterviewRequest):
 
 @app.post("/transcribe")
 async def transcribe_audio(file: UploadFile = File(...)):
-    temp_path = "temp_voice.wav"
-    with open(temp_path, "wb") as buffer:
-        buffer.write(await file.read())
+    # The upload is a private spooled buffer (memory, or its own temp file when
+    # large) read straight into memory: no shared path on disk
+    try:
+        check_audio_size(file.size or 0)
+    except AudioTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    try:
+        audio_bytes = await file.read()
+    finally:
+        await file.close()
+    # Speech timing runs alongside Whisper on the same bytes; the `user_turn` that
+    # quotes `upload_id` uses it instead of the client-reported duration/silence
+    text, activity = await asyncio.gather(
+        transcribe(audio_bytes, audio_filename(file.filename, file.content_type)),
+        analyze_audio(audio_bytes)
+    )
+    upload_id = None
+    if activity and text:
+        upload_id = secrets.token_urlsafe(12)
+        voice_activity_cache.put(upload_id, activity)
+    return {"text": text, "upload_id": upload_id} # Empty text for noise so the AI doesn't reply to a 'noise' message
+
+class InterviewChannel:
+    """
+    Outbound side of /ws/interview plus the options the client negotiated:
+    - stream: token deltas + sentence audio chunks instead of one `ai_turn`
+    - binary_audio: audio as a raw binary frame right after its JSON header,
+      instead of base64 inside the JSON
+    All sends share one lock so a header and its audio frame are never split
+    by a concurrent send.
+    """
+    
+    def __init__(self, websocket: WebSocket, stream: bool = False, binary_audio: bool = False):
+        self.websocket = websocket
+        self.stream = stream
+        self.binary_audio = binary_audio
+        self._send_lock = asyncio.Lock()
+    
+    async def send_json(self, message: dict):
+        async with self._send_lock:
+            await self.websocket.send_json(message)
     
+    async def send_with_audio(self, message: dict, audio: bytes | None):
+        async with self._send_lock:
+            if audio and self.binary_audio:
+                await self.websocket.send_json({**message, "audio": None, "audio_bytes": len(audio), "audio_format": "mp3"})
+                await self.websocket.send_bytes(audio)
+            else:
+                audio_b64 = base64.b64encode(audio).decode('utf-8') if audio else None
+                await self.websocket.send_json({**message, "audio": audio_b64})
+
+async def generate_ai_turn(channel: InterviewChannel, session_data: dict, chat_history: list,
+                           interview_context: str) -> str:
+    """
+    Produce the interviewer's next reply.
+    In streaming mode tokens are forwarded as `ai_turn_delta` frames as they arrive,
+    and each finished sentence is synthesized in parallel and pushed as an ordered
+    `ai_audio_chunk` frame; the caller sends the full text afterwards either way.
+    """
+    args = (session_data["candidate_summary"], session_data["job_description"], chat_history, interview_context)
+    kwargs = {"difficulty": session_data.get("difficulty", "medium"), "topic": session_data.get("interview_topic", "")}
+    if not channel.stream:
+        return await get_ai_response(*args, **kwargs)
+    
+    async def send_chunk(seq: int, sentence: str, audio: bytes):
+        await channel.send_with_audio({"type": "ai_audio_chunk", "seq": seq, "text": sentence}, audio)
+    
+    pipeline = SentenceAudioPipeline(send_chunk)
+    parts = []
     try:
-        with open(temp_path, "rb") as audio_file:
-            transcript = await client.audio.transcriptions.create(
-                model="whisper-1", 
-                file=audio_file,
-                language="en", # Forces English to stop the Korean hallucinations
-                prompt="Technical interview conversation about software development." # Contextual hint
-            )
-        
-        # Filter out "hallucinations" (very short or nonsense noise)
-        text = transcript.text.strip()
-        if len(text) < 2: 
-            return {"text": ""} # Return empty so the AI doesn't reply to a 'noise' message
-            
-        return {"text": text}
-        
-    except Exception as e:
-        print(f"Transcription error: {e}")
-        return {"text": ""}
+        async for delta in stream_ai_response(*args, **kwargs):
+            parts.append(delta)
+            pipeline.feed(delta)
+            await channel.send_json({"type": "ai_turn_delta", "delta": delta})
+        await pipeline.finish()
+    except BaseException:
+        pipeline.cancel()
+        raise
+    return "".join(parts)
+
+async def send_ai_turn(channel: InterviewChannel, text: str, speak: bool = True):
+    """
+    Send the completed reply: `ai_turn` with the full audio for classic clients,
+    `ai_turn_done` for streaming clients (their audio already went out in chunks).
+    """
+    audio_bytes = await generate_audio_async(text) if speak and not channel.stream else None
+    await channel.send_with_audio({"type": "ai_turn_done" if channel.stream else "ai_turn", "text": text}, audio_bytes)
+
+async def apply_evaluation(session, job: dict, scores: dict, logic_result: dict):
+    """EvaluationQueue callback: record and persist one answer's scores, then push its logic feedback."""
+    session_data = session.data
+    q_index = job["question_index"]
+    # Hold the session lock so hint requests never see a half-recorded answer,
+    # and commit under it so other workers see the score as soon as it lands
+    async with session.lock:
+        # Looked up under the lock: a refresh may have swapped in a newer copy
+        state = session_data.get("interview_state")
+        drop_pending_evaluation(session_data, q_index)
+        if state is None:
+            await sessions.commit(session, "pending_evaluations")
+            return
+        state.record_score(
+            question=job["question"],
+            answer=job["answer"],
+            category=job["category"],
+            topic=job["topic"],
+            accuracy=scores["accuracy"],
+            depth=scores["depth"],
+            clarity=scores["clarity"]
+        )
+        session_data["answer_scores"].append({
+            "question": job["question"],
+            "answer": job["answer"],
+            "category": job["category"],
+            "scores": scores
+        })
+        print(f"[Evaluation] Q{q_index}: accuracy={scores['accuracy']}, depth={scores['depth']}, clarity={scores['clarity']}")
         
-    finally:
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
+        has_issue = bool(logic_result and logic_result.get("has_issue"))
+        if has_issue:
+            state.record_logical_error(
+                question_index=q_index,
+                issue_type=logic_result["issue_type"],
+                feedback=logic_result["feedback"],
+                severity=logic_result["severity"]
+            )
+        # A conflicting write (e.g. a hint on another worker) is merged in and retried
+        await sessions.commit(session, "interview_state", "answer_scores", "pending_evaluations")
+    
+    # Send logic feedback asynchronously, to whichever socket the candidate is on now
+    channel = session.cache.get("interview_channel")
+    if has_issue and channel:
+        try:
+            await channel.send_json({
+                "type": "logic_feedback",
+                "question_index": q_index,
+                "issue_type": logic_result["issue_type"],
+                "feedback": logic_result["feedback"],
+                "severity": logic_result["severity"]
+            })
+        except Exception as e:
+            print(f"[Logic Validator] Feedback not delivered: {e}")
+    if has_issue:
+        print(f"[Logic Validator] {logic_result['severity'].upper()}: {logic_result['feedback']}")
+
+def drop_pending_evaluation(session_data: dict, q_index: int):
+    session_data["pending_evaluations"] = [i for i in session_data.get("pending_evaluations", []) if i != q_index]
+
+async def abandon_evaluation(session, job: dict):
+    """EvaluationQueue error callback: stop other workers' drains from waiting on a score that won't come."""
+    async with session.lock:
+        drop_pending_evaluation(session.data, job["question_index"])
+        await sessions.commit(session, "pending_evaluations")
+
+def get_evaluation_queue(session) -> EvaluationQueue:
+    queue = session.cache.get("evaluations")
+    if queue is None:
+        queue = EvaluationQueue(
+            lambda job, scores, logic_result: apply_evaluation(session, job, scores, logic_result),
+            on_error=lambda job: abandon_evaluation(session, job)
+        )
+        session.cache["evaluations"] = queue
+    return queue
+
+async def drain_evaluations(session):
+    """
+    Wait for queued answer evaluations, so a report includes every score. Each is
+    committed as it is applied. The queue only exists on the worker running the
+    interview socket; any other worker polls the session's `pending_evaluations`.
+    """
+    queue = session.cache.get("evaluations")
+    if queue:
+        await queue.drain()
+    deadline = time.monotonic() + EVALUATION_DRAIN_TIMEOUT
+    while session.data.get("pending_evaluations"):
+        if time.monotonic() >= deadline:
+            print(f"[Evaluation Queue] Drain timed out waiting on Q{session.data['pending_evaluations']}")
+            return
+        await asyncio.sleep(EVALUATION_POLL_SECONDS)
+        await sessions.refresh(session)
+
+async def transcribe_user_audio(channel: InterviewChannel, audio: bytes, header: dict) -> tuple | None:
+    """
+    Turn a `user_audio` recording into (`user_turn` message, VAD result). Whisper
+    and the VAD run together on the bytes; the transcript is echoed to the client
+    as `user_transcript` and None is returned when there is nothing to answer.
+    The VAD result stays out of the message, which only ever carries client data.
+    """
+    try:
+        check_audio_size(len(audio))
+    except AudioTooLargeError as e:
+        await channel.send_json({"type": "user_transcript", "text": "", "error": str(e)})
+        return None
+    mime_type = header.get("mime_type") or ("audio/wav" if audio[:4] == b"RIFF" else "audio/webm")
+    text, activity = await asyncio.gather(
+        transcribe(audio, audio_filename(None, mime_type)),
+        analyze_audio(audio)
+    )
+    await channel.send_json({"type": "user_transcript", "text": text})
+    if not text:
+        return None
+    return {
+        "type": "user_turn",
+        "text": text,
+        "duration": header.get("duration", 0),
+        "silence_duration": header.get("silence_duration", 0)
+    }, activity
 
 @app.websocket("/ws/interview")
-async def interview_websocket(websocket: WebSocket):
-    await websocket.accept()
-    
+async def interview_websocket(websocket: WebSocket, session_id: Optional[str] = None,
+                              stream: bool = False, audio: str = "base64"):
+    session = await sessions.resolve(session_id)
+    if session is None:
+        await websocket.close(code=1008, reason="Session not found or expired")
+        return
+    # Pin the session for the lifetime of the socket so eviction skips it
+    sessions.connect(session)
+    try:
+        await websocket.accept()
+        channel = InterviewChannel(websocket, stream=stream, binary_audio=(audio == "binary"))
+        await run_interview(websocket, channel, session)
+    finally:
+        sessions.disconnect(session)
+
+async def run_interview(websocket: WebSocket, channel: InterviewChannel, session):
+    session_data = session.data
     chat_history = []
+    session.cache["interview_channel"] = channel  # Where queued logic feedback is sent
     
     # Initialize interview state from the plan
     plan = session_data.get("interview_plan")
@@ -277,19 +495,14 @@ async def interview_websocket(websocket: WebSocket):
         session_data["interview_state"] = state
     else:
         state = None
+    session.mark_dirty("interview_state", "transcript")
     
     # 1. Opening — use the structured plan for the first question
     # Works in both resume mode (candidate_summary set) and topic mode (interview_topic set)
     if session_data["candidate_summary"] or session_data.get("interview_topic"):
         interview_context = state.to_context_string() if state else ""
         
-        response_text = await get_ai_response(
-            session_data["candidate_summary"],
-            session_data["job_description"],
-            chat_history,
-            interview_context,
-            session_data.get("interview_topic", "")
-        )
+        response_text = await generate_ai_turn(channel, session_data, chat_history, interview_context)
         
         # Track the question for evaluation later
         if state:
@@ -304,28 +517,56 @@ async def interview_websocket(websocket: WebSocket):
         chat_history.append({"role": "assistant", "content": response_text})
         session_data["transcript"].append({"role": "ai", "content": response_text})
         
-        audio_bytes = generate_audio(response_text)
-        audio_b64 = base64.b64encode(audio_bytes).decode('utf-8') if audio_bytes else None
-        
-        await websocket.send_json({
-            "type": "ai_turn",
-            "text": response_text,
-            "audio": audio_b64
-        })
+        await send_ai_turn(channel, response_text)
+    await sessions.commit(session, "interview_state", "transcript")
 
     # 2. Conversation Loop with plan tracking + answer evaluation
     try:
         while True:
-            data = await websocket.receive_text()
-            msg = json.loads(data)
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            if message.get("bytes") is not None:
+                # Bare binary frame: a recording with no header
+                msg = {"type": "user_audio"}
+                audio_bytes = message["bytes"]
+            else:
+                msg = json.loads(message["text"])
+                audio_bytes = None
+            voice_activity = None  # Only ever set server-side
+            
+            if msg["type"] == "user_audio":
+                # Recorded answer sent on the socket: a JSON header, then the audio as
+                # one binary frame. Transcribed here, so it skips the /transcribe round trip
+                if audio_bytes is None:
+                    message = await websocket.receive()
+                    if message["type"] == "websocket.disconnect":
+                        break
+                    audio_bytes = message.get("bytes")
+                    if audio_bytes is None:
+                        await channel.send_json({"type": "user_transcript", "text": "",
+                                                 "error": "Expected the recording as a binary frame after the user_audio header"})
+                        continue
+                transcribed = await transcribe_user_audio(channel, audio_bytes, msg)
+                if transcribed is None:
+                    continue
+                msg, voice_activity = transcribed
             
             if msg["type"] == "user_turn":
+                # One read per turn: pick up hint usage recorded by other workers
+                await sessions.refresh(session)
+                state = session_data.get("interview_state")
+                # Held until this turn's commit, so a score committed mid-turn can't un-dirty them
+                session.hold(*TURN_FIELDS)
                 try:
                     user_text = msg["text"]
                     
                     # Feature 4: Extract speech timing from client
                     speech_duration = msg.get("duration", 0)  # seconds of speaking
                     silence_duration = msg.get("silence_duration", 0)  # pause before speaking
+                    # Server-side VAD of the recording: from `user_audio`, or from the
+                    # /transcribe upload when this worker handled it
+                    voice_activity = voice_activity or voice_activity_cache.pop(msg.get("upload_id"))
                     
                     chat_history.append({"role": "user", "content": user_text})
                     session_data["transcript"].append({"role": "user", "content": user_text})
@@ -341,111 +582,65 @@ async def interview_websocket(websocket: WebSocket):
                     # Generate next question context
                     interview_context = state.to_context_string() if state else ""
                     
-                    # Create tasks for parallel execution
-                    eval_task = None
-                    logic_task = None
-                    ai_response_task = asyncio.create_task(get_ai_response(
-                        session_data["candidate_summary"],
-                        session_data["job_description"],
-                        chat_history,
-                        interview_context,
-                        session_data.get("interview_topic", "")
-                    ))
+                    # Score + logic check run in the session's evaluation queue, so neither
+                    # this reply nor the next answer waits on them
+                    evaluation_queued = False
                     
                     if state and state.current_question_text and not state.is_complete:
                         if step:
                             # Feature 2: Logic validation & Evaluation
-                            eval_task = asyncio.create_task(evaluate_answer(
+                            get_evaluation_queue(session).submit(
+                                state.total_questions_asked,
+                                evaluate_turn(
+                                    question=state.current_question_text,
+                                    answer=user_text,
+                                    category=step["category_name"],
+                                    topic=step["topic"],
+                                    candidate_summary=session_data["candidate_summary"],
+                                    job_desc=session_data["job_description"],
+                                    chat_history=list(chat_history),
+                                    logic_topic=current_topic
+                                ),
                                 question=state.current_question_text,
                                 answer=user_text,
                                 category=step["category_name"],
-                                topic=step["topic"],
-                                candidate_summary=session_data["candidate_summary"],
-                                job_desc=session_data["job_description"]
-                            ))
-                            logic_task = asyncio.create_task(validate_logic(
-                                question=state.current_question_text,
-                                answer=user_text,
-                                topic=current_topic,
-                                chat_history=chat_history
-                            ))
+                                topic=step["topic"]
+                            )
+                            # Persisted with this turn, so a drain on another worker knows to wait
+                            session_data.setdefault("pending_evaluations", []).append(state.total_questions_asked)
+                            evaluation_queued = True
 
-                    # Wait for AI response first to reduce latency
+                    # Generate the reply while evaluation runs in the background
                     try:
-                        ai_reply = await ai_response_task
+                        ai_reply = await generate_ai_turn(channel, session_data, chat_history, interview_context)
                     except Exception as e:
                         print(f"AI Generation Error: {e}")
-                        ai_reply = "I'm having trouble thinking of a response. Let's continue."
+                        ai_reply = AI_ERROR_REPLY
 
                     # Send AI response immediately
                     chat_history.append({"role": "assistant", "content": ai_reply})
                     session_data["transcript"].append({"role": "ai", "content": ai_reply})
                     
-                    audio_bytes = generate_audio(ai_reply)
-                    audio_b64 = base64.b64encode(audio_bytes).decode('utf-8') if audio_bytes else None
-                    
-                    await websocket.send_json({
-                        "type": "ai_turn",
-                        "text": ai_reply,
-                        "audio": audio_b64
-                    })
-
-                    # Process evaluation results in background (or await them now without blocking UI)
-                    if eval_task and logic_task:
-                        try:
-                            scores, logic_result = await asyncio.gather(eval_task, logic_task)
-                            
-                            # Record the score
-                            state.record_score(
-                                question=state.current_question_text,
-                                answer=user_text,
-                                category=step["category_name"],
-                                topic=step["topic"],
-                                accuracy=scores["accuracy"],
-                                depth=scores["depth"],
-                                clarity=scores["clarity"]
-                            )
-                            session_data["answer_scores"].append({
-                                "question": state.current_question_text,
-                                "answer": user_text,
-                                "category": step["category_name"],
-                                "scores": scores
-                            })
-                            print(f"[Evaluation] Q{state.total_questions_asked}: accuracy={scores['accuracy']}, depth={scores['depth']}, clarity={scores['clarity']}")
-                            
-                            # Send logic feedback if issue found
-                            if logic_result and logic_result.get("has_issue"):
-                                state.record_logical_error(
-                                    question_index=state.total_questions_asked,
-                                    issue_type=logic_result["issue_type"],
-                                    feedback=logic_result["feedback"],
-                                    severity=logic_result["severity"]
-                                )
-                                # Send logic feedback asynchronously
-                                await websocket.send_json({
-                                    "type": "logic_feedback",
-                                    "issue_type": logic_result["issue_type"],
-                                    "feedback": logic_result["feedback"],
-                                    "severity": logic_result["severity"]
-                                })
-                                print(f"[Logic Validator] {logic_result['severity'].upper()}: {logic_result['feedback']}")
-                                
-                            # Advance the plan
+                    await send_ai_turn(channel, ai_reply)
+
+                    # Advance the plan without waiting for the score; the lock keeps hint
+                    # requests from seeing a half-advanced plan
+                    state = session_data.get("interview_state")  # Re-read after every await
+                    if evaluation_queued:
+                        async with session.lock:
                             state.advance()
-                            
-                        except Exception as e:
-                            print(f"Evaluation Error: {e}")
 
                     # Feature 4: Speech confidence analysis
                     try:
                         speech_analysis = analyze_speech_confidence(
                             text=user_text,
                             duration_seconds=speech_duration,
-                            silence_duration=silence_duration
+                            silence_duration=silence_duration,
+                            voice_activity=voice_activity
                         )
                         
                         if speech_analysis["confidence_level"] != "high" or speech_analysis["long_silence"]:
-                            await websocket.send_json({
+                            await channel.send_json({
                                 "type": "speech_feedback",
                                 "wpm": speech_analysis["wpm"],
                                 "pace": speech_analysis["pace"],
@@ -459,6 +654,7 @@ async def interview_websocket(websocket: WebSocket):
                         print(f"Speech Analysis Error: {e}")
                     
                     # Track this question for next evaluation
+                    state = session_data.get("interview_state")
                     if state:
                         state.current_question_text = ai_reply
                         state.mark_question_asked(state.total_questions_asked)
@@ -470,40 +666,124 @@ async def interview_websocket(websocket: WebSocket):
                     print(f"Error processing message: {processing_error}")
                     traceback.print_exc()
                     # Send a fallback message to keep the UI alive
-                    await websocket.send_json({
-                        "type": "ai_turn",
-                        "text": "I'm having a little trouble processing that. Could you say it again?",
-                        "audio": None
-                    })
+                    await send_ai_turn(channel, "I'm having a little trouble processing that. Could you say it again?", speak=False)
+                finally:
+                    session.release(*TURN_FIELDS)
+
+                # One write per turn
+                await sessions.commit(session, *TURN_FIELDS)
 
     except Exception as e:
         print(f"WebSocket closed or error: {e}")
         traceback.print_exc()
+    finally:
+        if session.cache.get("interview_channel") is channel:
+            session.cache.pop("interview_channel")
 
 @app.websocket("/ws/video")
-async def video_websocket(websocket: WebSocket):
-    await websocket.accept()
-    stabilizer = Stabilizer()
+async def video_websocket(websocket: WebSocket, session_id: Optional[str] = None, latest: bool = False):
+    """
+    Default mode analyzes every frame in arrival order. With `latest=true` the
+    socket is drained continuously and only the freshest frame is analyzed, so
+    feedback latency stays bounded when analysis can't keep up; each result then
+    carries processed/dropped fps and, when dropping, a `suggested_fps` the
+    client can lower its capture rate to.
+    """
+    session = await sessions.resolve(session_id)
+    if session is None:
+        await websocket.close(code=1008, reason="Session not found or expired")
+        return
+    session_data = session.data
+    sessions.connect(session)
+    # One Stabilizer per connection, kept in whichever vision worker this key maps to
+    stream_key = f"{session.session_id}:{secrets.token_hex(4)}"
+    last_flush = time.time()
+    
+    async def handle_result(result: dict):
+        nonlocal last_flush
+        # Store metric with timestamp
+        timestamp = time.time()
+        session_data["video_metrics"].append(timestamp, result["focus"], result["emotion"],
+                                             result["confidence"], result["stress"])
+        session.mark_dirty("video_metrics")
+        
+        # Batch metric writes instead of persisting every frame
+        if timestamp - last_flush >= VIDEO_FLUSH_SECONDS:
+            await sessions.commit(session, "video_metrics")
+            last_flush = timestamp
+        
+        await websocket.send_json(result)
     
     try:
+        await websocket.accept()
+        if latest:
+            await run_latest_frame_video(websocket, stream_key, handle_result)
+            return
         while True:
-            data = await websocket.receive_text()
-            # data is expected to be a base64 string
-            result = process_video_frame(data, stabilizer)
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            # Raw JPEG/WebP bytes from binary-capable clients, base64 data URL otherwise
+            data = message.get("bytes")
+            if data is None:
+                data = message.get("text")
+            result = await vision.process(stream_key, data)
             if result:
-                # Store metric with timestamp
-                metric_entry = {
-                    "timestamp": time.time(),
-                    "focus": result["focus"],
-                    "emotion": result["emotion"],
-                    "confidence": result["confidence"],
-                    "stress": result["stress"]
-                }
-                session_data["video_metrics"].append(metric_entry)
-                
-                await websocket.send_json(result)
+                await handle_result(result)
     except Exception as e:
         print(f"Video WebSocket error: {e}")
+    finally:
+        sessions.disconnect(session)
+        await vision.release(stream_key)
+        try:
+            await sessions.commit(session, "video_metrics")
+        except Exception as e:
+            print(f"Video metrics flush failed: {e}")
+
+async def run_latest_frame_video(websocket: WebSocket, stream_key: str, handle_result):
+    """Latest-frame-wins loop: a reader keeps overwriting one slot while frames are analyzed one at a time."""
+    slot = LatestFrameSlot()
+    meter = FrameRateMeter()
+    
+    async def read_frames():
+        try:
+            while True:
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    break
+                data = message.get("bytes")
+                slot.put(data if data is not None else message.get("text"))
+        except Exception as e:
+            print(f"Video WebSocket read error: {e}")
+        finally:
+            slot.close()
+    
+    reader = asyncio.create_task(read_frames())
+    processed = empty = 0
+    # Includes frames superseded while a result is being sent, so none go uncounted
+    dropped_seen = slot.dropped
+    try:
+        while True:
+            data = await slot.take()
+            if data is None:
+                break
+            result = await vision.process(stream_key, data)
+            meter.record(processed=1 if result else 0, dropped=slot.dropped - dropped_seen, empty=0 if result else 1)
+            dropped_seen = slot.dropped
+            if not result:
+                empty += 1
+                continue
+            processed += 1
+            rates = meter.rates()
+            total_fps = rates["processed_fps"] + rates["dropped_fps"]
+            # Ask the client to slow down once more than a quarter of its frames are wasted,
+            # judged over a full window so the vision worker's warm-up doesn't count
+            if meter.has_full_window() and total_fps and rates["dropped_fps"] / total_fps > 0.25:
+                rates["suggested_fps"] = max(1, int(rates["processed_fps"]))
+            await handle_result({**result, "frames": rates})
+    finally:
+        reader.cancel()
+        print(f"[Video] {stream_key}: {processed} frames analyzed, {empty} without a result, {slot.dropped} superseded")
 
 @app.post("/api/stop-camera")
 async def stop_camera():
@@ -511,18 +791,21 @@ async def stop_camera():
     return {"status": "ok", "message": "Camera stop acknowledged"}
 
 @app.get("/report")
-async def get_report_data():
+async def get_report_data(session_id: Optional[str] = None):
     """
     Returns the accumulated session data for the report page.
     Now includes per-answer evaluation scores from the interview state.
     """
+    session = await get_session(session_id)
+    await drain_evaluations(session)
+    session_data = session.data
     # Get scores summary from interview state
     state = session_data.get("interview_state")
     scores_summary = state.get_scores_summary() if state else {"total_questions": 0, "per_question": [], "per_category": {}}
     
     return {
         "transcript": session_data["transcript"],
-        "video_metrics": session_data["video_metrics"],
+        "video_metrics": session_data["video_metrics"].to_records(VIDEO_METRICS_EXPORT_POINTS),
         "job_description": session_data["job_description"],
         "answer_evaluation": scores_summary,
         "interview_plan": session_data.get("interview_plan"),
@@ -533,8 +816,9 @@ async def get_report_data():
 # History endpoints removed per user request
 
 @app.get("/api/session/download-pdf")
-async def download_session_pdf():
+async def download_session_pdf(session_id: Optional[str] = None):
     """Generates and downloads PDF from current session data without saving to DB"""
+    session_data = (await get_session(session_id)).data
     try:
         # Use a temporary user ID for the report generation
         temp_user_id = "session_user"
@@ -577,118 +861,39 @@ def get_most_common_emotion(interviews: List[Dict]) -> str:
         return "neutral"
     return max(set(emotions), key=emotions.count)
 
-async def generate_analytics_response(metrics, transcript, scores_summary=None, candidate_summary="", job_description=""):
-    """Helper to generate analytics response structure from raw data"""
-    # Calculate averages from video metrics
-    if metrics:
-        avg_focus = sum(m["focus"] for m in metrics) / len(metrics)
-        avg_emotion = sum(m["emotion"] for m in metrics) / len(metrics)
-        avg_confidence = sum(m["confidence"] for m in metrics) / len(metrics)
-        avg_stress = sum(m.get("stress", 0) for m in metrics) / len(metrics)
-    else:
-        avg_focus = avg_emotion = avg_confidence = 0
-        avg_stress = 50
-    
-    # Calculate per-question metrics (group by 30-second windows)
-    per_question_metrics = []
-    if metrics:
-        # Group metrics into question-like segments
-        segment_size = max(1, len(metrics) // 5)  # Divide into ~5 segments
-        for i in range(0, len(metrics), segment_size):
-            segment = metrics[i:i+segment_size]
-            if segment:
-                per_question_metrics.append({
-                    "question_index": len(per_question_metrics) + 1,
-                    "eye_contact_percentage": sum(m["focus"] for m in segment) / len(segment),
-                    "confidence": sum(m["confidence"] for m in segment) / len(segment)
-                })
-    
-    # Sentiment trend from transcript (simplified)
-    sentiment_trend = []
-    for entry in transcript:
-        if entry["role"] == "user":
-            # Basic sentiment: positive words = +, negative words = -
-            text = entry["content"].lower()
-            positive_words = ["good", "great", "excellent", "love", "happy", "excited", "confident"]
-            negative_words = ["bad", "difficult", "hard", "nervous", "worried", "afraid", "confused"]
-            pos_count = sum(1 for w in positive_words if w in text)
-            neg_count = sum(1 for w in negative_words if w in text)
-            sentiment = (pos_count - neg_count) / max(1, pos_count + neg_count + 1)
-            sentiment_trend.append(sentiment)
-    
-    # Filler word detection
-    filler_words = ["um", "uh", "like", "you know", "basically", "actually", "literally"]
-    total_fillers = 0
-    filler_counts = {}
-    total_words = 0
-    
-    for entry in transcript:
-        if entry["role"] == "user":
-            words = entry["content"].lower().split()
-            total_words += len(words)
-            for filler in filler_words:
-                count = entry["content"].lower().count(filler)
-                total_fillers += count
-                filler_counts[filler] = filler_counts.get(filler, 0) + count
-    
-    most_common_fillers = sorted(filler_counts.items(), key=lambda x: x[1], reverse=True)[:5]
-    filler_rate = (total_fillers / max(1, total_words)) * 100
-    
-    # Talk-to-listen ratio
-    user_messages = sum(1 for t in transcript if t["role"] == "user")
-    ai_messages = sum(1 for t in transcript if t["role"] == "ai")
-    talk_ratio = user_messages / max(1, ai_messages)
-    
-    # Use answer evaluation to enhance technical_accuracy if available
-    if scores_summary and scores_summary.get("total_questions", 0) > 0:
-        # Scale LLM-evaluated accuracy (1-10) to 0-100 for the radar chart
-        technical_accuracy = scores_summary["overall_accuracy"] * 10
-        communication_score = scores_summary["overall_clarity"] * 10
-    else:
-        technical_accuracy = min(100, avg_confidence + 15)
-        communication_score = min(100, avg_emotion + 20)
-    
-    return {
-        "feedback": await generate_interview_feedback(transcript, scores_summary, candidate_summary, job_description),
-        "radar_chart_data": {
-            "technical_accuracy": technical_accuracy,
-            "communication": communication_score,
-            "confidence": avg_confidence,
-            "focus": avg_focus,
-            "emotional_intelligence": avg_emotion
-        },
-        "vision_analytics": {
-            "overall_eye_contact_percentage": avg_focus,
-            "overall_steadiness_percentage": 100 - avg_stress,
-            "per_question_metrics": per_question_metrics
-        },
-        "nlp_report": {
-            "total_filler_count": total_fillers,
-            "filler_rate": filler_rate,
-            "talk_to_listen_ratio": talk_ratio,
-            "most_common_fillers": most_common_fillers,
-            "sentiment_trend": sentiment_trend
-        },
-        "scoring_summary": {
-            "average_score": (avg_focus + avg_emotion + avg_confidence) / 3,
-            "scores_over_time": [m["confidence"] for m in metrics[-10:]] if metrics else []
-        },
-        "answer_evaluation": scores_summary
-    }
+async def get_interview_feedback(session, scores_summary) -> dict:
+    """LLM feedback for the analytics page, regenerated only when the transcript or scores change."""
+    session_data = session.data
+    key = (len(session_data["transcript"]), scores_summary.get("total_questions") if scores_summary else 0)
+    cached = session.cache.get("feedback")
+    if cached and cached[0] == key:
+        return cached[1]
+    feedback = await generate_interview_feedback(
+        session_data["transcript"], scores_summary,
+        session_data.get("candidate_summary", ""), session_data.get("job_description", "")
+    )
+    session.cache["feedback"] = (key, feedback)
+    return feedback
 
 @app.get("/api/analytics")
-async def get_analytics():
+async def get_analytics(session_id: Optional[str] = None):
     """Returns analytics for current active session"""
+    session = await get_session(session_id)
+    session_data = session.data
     try:
         state = session_data.get("interview_state")
         scores_summary = state.get_scores_summary() if state else None
         
-        return await generate_analytics_response(
-            session_data.get("video_metrics", []),
-            session_data.get("transcript", []),
+        # Fold in only the turns added since the last poll
+        stats = session.cache.setdefault("transcript_stats", TranscriptStats())
+        stats.update(session_data["transcript"])
+        
+        return build_analytics_response(
+            session_data["video_metrics"],
+            stats,
             scores_summary,
-            session_data.get("candidate_summary", ""),
-            session_data.get("job_description", "")
+            feedback=await get_interview_feedback(session, scores_summary),
+            question_timestamps=state.question_timestamps if state else None
         )
     except Exception as e:
         print(f"Analytics Generation Error: {e}")
@@ -726,105 +931,7 @@ async def get_historical_analytics(interview_id: str):
             "overall_depth": avg_score / 10     # Approximation
         }
         
-    return generate_analytics_response(metrics, transcript, scores_summary)
-
-def generate_analytics_response(metrics, transcript, scores_summary=None):
-    """Helper to generate analytics response structure from raw data"""
-    # Calculate averages from video metrics
-    if metrics:
-        avg_focus = sum(m["focus"] for m in metrics) / len(metrics)
-        avg_emotion = sum(m["emotion"] for m in metrics) / len(metrics)
-        avg_confidence = sum(m["confidence"] for m in metrics) / len(metrics)
-        avg_stress = sum(m.get("stress", 0) for m in metrics) / len(metrics)
-    else:
-        avg_focus = avg_emotion = avg_confidence = 0
-        avg_stress = 50
-    
-    # Calculate per-question metrics (group by 30-second windows)
-    per_question_metrics = []
-    if metrics:
-        # Group metrics into question-like segments
-        segment_size = max(1, len(metrics) // 5)  # Divide into ~5 segments
-        for i in range(0, len(metrics), segment_size):
-            segment = metrics[i:i+segment_size]
-            if segment:
-                per_question_metrics.append({
-                    "question_index": len(per_question_metrics) + 1,
-                    "eye_contact_percentage": sum(m["focus"] for m in segment) / len(segment),
-                    "confidence": sum(m["confidence"] for m in segment) / len(segment)
-                })
-    
-    # Sentiment trend from transcript (simplified)
-    sentiment_trend = []
-    for entry in transcript:
-        if entry["role"] == "user":
-            # Basic sentiment: positive words = +, negative words = -
-            text = entry["content"].lower()
-            positive_words = ["good", "great", "excellent", "love", "happy", "excited", "confident"]
-            negative_words = ["bad", "difficult", "hard", "nervous", "worried", "afraid", "confused"]
-            pos_count = sum(1 for w in positive_words if w in text)
-            neg_count = sum(1 for w in negative_words if w in text)
-            sentiment = (pos_count - neg_count) / max(1, pos_count + neg_count + 1)
-            sentiment_trend.append(sentiment)
-    
-    # Filler word detection
-    filler_words = ["um", "uh", "like", "you know", "basically", "actually", "literally"]
-    total_fillers = 0
-    filler_counts = {}
-    total_words = 0
-    
-    for entry in transcript:
-        if entry["role"] == "user":
-            words = entry["content"].lower().split()
-            total_words += len(words)
-            for filler in filler_words:
-                count = entry["content"].lower().count(filler)
-                total_fillers += count
-                filler_counts[filler] = filler_counts.get(filler, 0) + count
-    
-    most_common_fillers = sorted(filler_counts.items(), key=lambda x: x[1], reverse=True)[:5]
-    filler_rate = (total_fillers / max(1, total_words)) * 100
-    
-    # Talk-to-listen ratio
-    user_messages = sum(1 for t in transcript if t["role"] == "user")
-    ai_messages = sum(1 for t in transcript if t["role"] == "ai")
-    talk_ratio = user_messages / max(1, ai_messages)
-    
-    # Use answer evaluation to enhance technical_accuracy if available
-    if scores_summary and scores_summary.get("total_questions", 0) > 0:
-        # Scale LLM-evaluated accuracy (1-10) to 0-100 for the radar chart
-        technical_accuracy = scores_summary["overall_accuracy"] * 10
-        communication_score = scores_summary["overall_clarity"] * 10
-    else:
-        technical_accuracy = min(100, avg_confidence + 15)
-        communication_score = min(100, avg_emotion + 20)
-    
-    return {
-        "radar_chart_data": {
-            "technical_accuracy": technical_accuracy,
-            "communication": communication_score,
-            "confidence": avg_confidence,
-            "focus": avg_focus,
-            "emotional_intelligence": avg_emotion
-        },
-        "vision_analytics": {
-            "overall_eye_contact_percentage": avg_focus,
-            "overall_steadiness_percentage": 100 - avg_stress,
-            "per_question_metrics": per_question_metrics
-        },
-        "nlp_report": {
-            "total_filler_count": total_fillers,
-            "filler_rate": filler_rate,
-            "talk_to_listen_ratio": talk_ratio,
-            "most_common_fillers": most_common_fillers,
-            "sentiment_trend": sentiment_trend
-        },
-        "scoring_summary": {
-            "average_score": (avg_focus + avg_emotion + avg_confidence) / 3,
-            "scores_over_time": [m["confidence"] for m in metrics[-10:]] if metrics else []
-        },
-        "answer_evaluation": scores_summary
-    }
+    return build_analytics_response(as_metrics_store(metrics), TranscriptStats.from_transcript(transcript), scores_summary)
 
 
 class RoadmapRequest(BaseModel):
@@ -846,7 +953,7 @@ async def get_audio_brief(request: AudioBriefRequest):
     if not request.text:
         raise HTTPException(status_code=400, detail="Text is required")
         
-    audio_bytes = generate_tts_audio(request.text)
+    audio_bytes = await generate_audio_async(request.text)
     if not audio_bytes:
         raise HTTPException(status_code=500, detail="Audio generation failed")
     
@@ -855,43 +962,6 @@ async def get_audio_brief(request: AudioBriefRequest):
     return {"audio_base64": audio_b64}
 
 
-@app.get("/api/analytics")
-async def get_analytics():
-    """Returns analytics for current active session"""
-    state = session_data.get("interview_state")
-    scores_summary = state.get_scores_summary() if state else None
-    
-    return generate_analytics_response(
-        session_data["video_metrics"],
-        session_data["transcript"],
-        scores_summary
-    )
-
-@app.get("/api/interview/{interview_id}/analytics")
-async def get_historical_analytics(interview_id: str):
-    """Returns analytics for a specific past interview"""
-    interview = await InterviewService.get_interview_by_id(interview_id)
-    if not interview:
-        raise HTTPException(status_code=404, detail="Interview not found")
-        
-    # Extract data from stored report
-    metrics = interview.video_metrics or []
-    transcript = interview.transcript or []
-    
-    # Construct scores summary if possible, or derive
-    scores_summary = None
-    if interview.questions_answers:
-        scores = [qa.semantic_score for qa in interview.questions_answers]
-        avg_score = sum(scores) / len(scores) if scores else 0
-        scores_summary = {
-            "total_questions": len(interview.questions_answers),
-            "overall_accuracy": avg_score / 10, # Converting back to 1-10 scale approximation
-            "overall_clarity": avg_score / 10,  # Approximation
-            "overall_depth": avg_score / 10     # Approximation
-        }
-        
-    return generate_analytics_response(metrics, transcript, scores_summary)
-
 @app.get("/api/user/{user_id}/analytics")
 async def get_user_analytics(user_id: str):
     """Get comprehensive analytics"""
@@ -934,8 +1004,9 @@ async def download_interview_pdf(interview_id: str):
 from services.report_generator import generate_report
 
 @app.get("/api/session/weakness-analysis")
-async def get_session_weakness():
+async def get_session_weakness(session_id: Optional[str] = None):
     """Get weakness analysis for the current session"""
+    session_data = (await get_session(session_id)).data
     state = session_data.get("interview_state")
     if not state:
         return {"topic_scores": {}, "classification": {"strong": [], "weak": [], "risk": []}, "patterns": []}
@@ -953,6 +1024,7 @@ async def get_session_weakness():
 
 class SaveSessionRequest(BaseModel):
     user_id: str
+    session_id: Optional[str] = None
 
 @app.post("/api/session/save")
 async def save_current_session(request: SaveSessionRequest):
@@ -960,6 +1032,9 @@ async def save_current_session(request: SaveSessionRequest):
     Generates a full report from the current in-memory session 
     and saves it to the database for the given user_id.
     """
+    session = await get_session(request.session_id)
+    await drain_evaluations(session)
+    session_data = session.data
     if not session_data.get("transcript"):
          raise HTTPException(status_code=400, detail="No active session data to save")
          
@@ -976,8 +1051,9 @@ async def save_current_session(request: SaveSessionRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/session/hint-status")
-async def get_hint_status():
+async def get_hint_status(session_id: Optional[str] = None):
     """Get current hint availability for progressive hint UI"""
+    session_data = (await get_session(session_id)).data
     state = session_data.get("interview_state")
     if not state:
         return {"available_level": "small", "used_levels": [], "question_index": 0}
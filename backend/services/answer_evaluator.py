@@ -0,0 +1,107 @@
+"""
+Answer Evaluator
+
+Scores an answer and checks its logic in one LLM request:
+- "combined" (default): a single JSON-mode call returns accuracy/depth/clarity
+  and the logic verdict, so question, answer and context are sent once
+- "split": the original evaluate_answer + validate_logic pair, run in parallel
+- A combined call that errors or returns unusable JSON falls back to split
+  for that answer
+"""
+
+import os
+import json
+import asyncio
+from openai import AsyncOpenAI
+from dotenv import load_dotenv
+from services.llm_service import evaluate_answer, clamp_scores
+from services.logic_validator import validate_logic, normalize_logic_result, recent_context
+
+load_dotenv()
+client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+EVALUATION_MODE = os.getenv("EVALUATION_MODE", "combined")  # combined | split
+EVALUATION_MODEL = "gpt-3.5-turbo"
+
+_metrics = {"combined": 0, "split": 0, "fallbacks": 0}
+
+
+async def evaluate_turn(question: str, answer: str, category: str, topic: str,
+                        candidate_summary: str, job_desc: str,
+                        chat_history: list | None = None, logic_topic: str | None = None) -> tuple:
+    """
+    (scores, logic_result) for one answer, shaped exactly like evaluate_answer()
+    and validate_logic() return them. `logic_topic` frames the split-mode logic
+    check (defaults to `topic`).
+    """
+    logic_topic = logic_topic or topic
+    if EVALUATION_MODE != "split":
+        try:
+            result = await _evaluate_combined(question, answer, category, topic,
+                                              candidate_summary, job_desc, chat_history)
+            _metrics["combined"] += 1
+            return result
+        except Exception as e:
+            _metrics["fallbacks"] += 1
+            print(f"[Evaluator] Combined evaluation failed, using split calls: {e}")
+
+    _metrics["split"] += 1
+    return tuple(await asyncio.gather(
+        evaluate_answer(question=question, answer=answer, category=category, topic=topic,
+                        candidate_summary=candidate_summary, job_desc=job_desc),
+        validate_logic(question=question, answer=answer, topic=logic_topic, chat_history=chat_history)
+    ))
+
+
+async def _evaluate_combined(question: str, answer: str, category: str, topic: str,
+                             candidate_summary: str, job_desc: str, chat_history: list | None) -> tuple:
+    prompt = f"""You are a technical interview evaluator. Score the candidate's answer and check it for logical errors.
+
+JOB ROLE: {job_desc}
+CANDIDATE PROFILE: {candidate_summary}
+INTERVIEW CATEGORY: {category}
+TOPIC: {topic}
+
+QUESTION ASKED: {question}
+CANDIDATE'S ANSWER: {answer}
+
+RECENT CONVERSATION CONTEXT:
+{recent_context(chat_history)}
+
+1. Score the answer on three dimensions (1-10 each):
+- accuracy: How correct and relevant is the answer? (1=wrong/irrelevant, 10=perfectly accurate)
+- depth: How thorough and detailed is the response? (1=superficial, 10=comprehensive with examples)
+- clarity: How well-structured and articulate is the answer? (1=confusing/rambling, 10=clear and concise)
+
+2. Check for these logic issues (in order of severity):
+- COMPLEXITY_ERROR: Wrong time/space complexity claim
+- MISSING_EDGE_CASE: Missing recursion base case, null/empty checks, off-by-one errors, boundary conditions
+- CONTRADICTION: Statement that contradicts something they said earlier in the conversation
+- INCORRECT_CLAIM: Factually wrong technical statement
+ONLY flag clear, definite errors — do NOT flag subjective or debatable points. Feedback is 1-2 encouraging
+sentences ("Think about...", "Double-check your..."); you are a mentor, not a judge.
+
+Return ONLY a JSON object:
+{{"accuracy": N, "depth": N, "clarity": N,
+  "logic": {{"has_issue": true|false, "issue_type": "complexity_error|missing_edge_case|contradiction|incorrect_claim|none", "feedback": "<text or empty>", "severity": "info|warning|error"}}}}"""
+
+    response = await client.chat.completions.create(
+        model=EVALUATION_MODEL,
+        messages=[{"role": "system", "content": prompt}],
+        response_format={"type": "json_object"},
+        temperature=0.1,
+        max_tokens=200,
+        timeout=10.0
+    )
+    result = json.loads(response.choices[0].message.content)
+    if not all(key in result for key in ("accuracy", "depth", "clarity")):
+        raise ValueError(f"missing scores in {result}")
+
+    logic = result.pop("logic", None)
+    scores = clamp_scores({key: result[key] for key in ("accuracy", "depth", "clarity")})
+    logic_result = normalize_logic_result(logic if isinstance(logic, dict) else {})
+    return scores, logic_result
+
+
+def get_evaluator_metrics() -> dict:
+    return {"mode": EVALUATION_MODE, **_metrics}
@@ -0,0 +1,164 @@
+"""
+Content-Addressed Audio Cache
+
+Synthesized speech keyed by hash(model, voice, text), in two tiers:
+- Memory: LRU bounded by total bytes
+- Disk: one file per key, written atomically so concurrent workers never
+  read a half-written clip; bounded by total bytes, evicting the least
+  recently used files (hits refresh a file's mtime) once over budget
+"""
+
+import hashlib
+import os
+import tempfile
+from collections import OrderedDict
+
+
+def audio_cache_key(text: str, voice: str, model: str) -> str:
+    return hashlib.sha256(f"{model}\0{voice}\0{text}".encode("utf-8")).hexdigest()
+
+
+DISK_EVICT_TARGET = 0.8  # Evict down to this fraction of the budget so eviction scans stay rare
+
+
+class AudioCache:
+    def __init__(self, max_memory_bytes: int = 32 * 1024 * 1024, disk_dir: str | None = None,
+                 max_disk_bytes: int = 256 * 1024 * 1024):
+        self.max_memory_bytes = max_memory_bytes
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self.memory_bytes = 0
+        self.disk_bytes = 0  # Estimate; other workers share the directory, so eviction re-measures it
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.disk_errors = 0
+        self.disk_evictions = 0
+
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+            self.disk_bytes = sum(size for _, size, _ in self._disk_entries())
+
+    # --- Memory tier ---
+
+    def get_memory(self, key: str) -> bytes | None:
+        audio = self._memory.get(key)
+        if audio is not None:
+            self._memory.move_to_end(key)
+        return audio
+
+    def put_memory(self, key: str, audio: bytes):
+        if len(audio) > self.max_memory_bytes:
+            return
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self.memory_bytes -= len(previous)
+        self._memory[key] = audio
+        self.memory_bytes += len(audio)
+        while self.memory_bytes > self.max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self.memory_bytes -= len(evicted)
+
+    # --- Disk tier (blocking; call from a worker thread) ---
+
+    def _path(self, key: str) -> str:
+        # Two-level fan-out keeps directories small
+        return os.path.join(self.disk_dir, key[:2], f"{key}.mp3")
+
+    def read_disk(self, key: str) -> bytes | None:
+        if not self.disk_dir:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                audio = f.read()
+            os.utime(path)  # Mark as recently used for eviction
+            return audio
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            self.disk_errors += 1
+            print(f"[Audio Cache] Disk read failed: {e}")
+            return None
+
+    def write_disk(self, key: str, audio: bytes):
+        """Write to a temp file in the target directory, then rename over the final path."""
+        if not self.disk_dir:
+            return
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(audio)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            self.disk_errors += 1
+            print(f"[Audio Cache] Disk write failed: {e}")
+            return
+        self.disk_bytes += len(audio)
+        if self.disk_bytes > self.max_disk_bytes:
+            self.evict_disk()
+
+    def _disk_entries(self) -> list:
+        """[(path, size, mtime)] for every cached clip."""
+        entries = []
+        for root, _, files in os.walk(self.disk_dir):
+            for name in files:
+                if not name.endswith(".mp3"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue  # Evicted by another worker meanwhile
+                entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def evict_disk(self):
+        """Delete least recently used clips until the directory is under DISK_EVICT_TARGET of its budget."""
+        entries = sorted(self._disk_entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        target = self.max_disk_bytes * DISK_EVICT_TARGET
+        for path, size, _ in entries:
+            if total <= target:
+                break
+            try:
+                os.unlink(path)
+                self.disk_evictions += 1
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                self.disk_errors += 1
+                print(f"[Audio Cache] Disk eviction failed: {e}")
+                continue
+            total -= size
+        self.disk_bytes = total
+
+    # --- Stats ---
+
+    def record_hit(self, tier: str):
+        if tier == "memory":
+            self.memory_hits += 1
+        else:
+            self.disk_hits += 1
+
+    def stats(self) -> dict:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_entries": len(self._memory),
+            "memory_bytes": self.memory_bytes,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 3) if lookups else 0.0,
+            "disk_bytes": self.disk_bytes,
+            "disk_evictions": self.disk_evictions,
+            "disk_errors": self.disk_errors
+        }
@@ -0,0 +1,88 @@
+"""
+Evaluation Queue
+
+Per-session background scoring, off the interview turn's critical path:
+- Each answer's evaluation starts the moment it is submitted, so slow LLM
+  calls for consecutive answers overlap
+- Results are applied strictly in question order by one worker task, so
+  scores and logic feedback never arrive out of sequence
+- drain() waits for everything queued, for endpoints that must see every
+  score (reports, saving the session). The queue is per process; other
+  workers wait on the pending list the session row carries instead
+"""
+
+import asyncio
+import os
+from collections import deque
+
+EVALUATION_DRAIN_TIMEOUT = float(os.getenv("EVALUATION_DRAIN_TIMEOUT", "30"))
+EVALUATION_POLL_SECONDS = 0.5  # How often a worker without the queue re-reads the session while draining
+
+
+class EvaluationQueue:
+    def __init__(self, on_result, on_error=None):
+        """
+        `on_result(job, *result)` is awaited for each finished job, in submission
+        order; `on_error(job)` for each job whose evaluation or callback failed.
+        """
+        self._on_result = on_result
+        self._on_error = on_error
+        self._jobs = deque()
+        self._worker = None
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self.completed = 0
+        self.failed = 0
+
+    def __len__(self):
+        return len(self._jobs)
+
+    def submit(self, question_index: int, evaluation, **context):
+        """
+        Queue the `evaluation` coroutine for `question_index`. `context` (question,
+        answer, category, ...) travels with the job to `on_result`.
+        """
+        if self._jobs and question_index <= self._jobs[-1]["question_index"]:
+            print(f"[Evaluation Queue] Q{question_index} submitted after Q{self._jobs[-1]['question_index']}")
+        job = {"question_index": question_index, "task": asyncio.create_task(evaluation), **context}
+        self._jobs.append(job)
+        self._idle.clear()
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while self._jobs:
+            job = self._jobs[0]
+            try:
+                result = await job["task"]
+                await self._on_result(job, *result)
+                self.completed += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.failed += 1
+                print(f"Evaluation Error (Q{job['question_index']}): {e}")
+                if self._on_error:
+                    try:
+                        await self._on_error(job)
+                    except Exception as e:
+                        print(f"[Evaluation Queue] Error handler failed (Q{job['question_index']}): {e}")
+            finally:
+                self._jobs.popleft()
+        self._idle.set()
+
+    async def drain(self, timeout: float = EVALUATION_DRAIN_TIMEOUT) -> bool:
+        """
+        Wait until every queued evaluation is applied (or `timeout` passes).
+        Returns True if there was anything to wait for.
+        """
+        if self._idle.is_set():
+            return False
+        try:
+            await asyncio.wait_for(asyncio.shield(self._idle.wait()), timeout)
+        except asyncio.TimeoutError:
+            print(f"[Evaluation Queue] Drain timed out with {len(self._jobs)} evaluations pending")
+        return True
+
+    def stats(self) -> dict:
+        return {"pending": len(self._jobs), "completed": self.completed, "failed": self.failed}
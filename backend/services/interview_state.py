@@ -1,5 +1,19 @@
 import time
 
+
+def merge_appended(local: list, remote: list) -> list:
+    """
+    Union of two copies of an append-only list: their common prefix, then
+    whatever each side appended since (local first).
+    """
+    common = 0
+    for mine, theirs in zip(local, remote):
+        if mine != theirs:
+            break
+        common += 1
+    return local + [entry for entry in remote[common:] if entry not in local[common:]]
+
+
 class InterviewState:
     """
     Tracks interview progress through the predefined plan.
@@ -223,3 +237,68 @@ class InterviewState:
             lines.append(f"Last answer scored: accuracy={last['accuracy']}/10, depth={last['depth']}/10, clarity={last['clarity']}/10")
         
         return "\n".join(lines)
+    
+    # --- Merging (shared session backends) ---
+    
+    def merge(self, other: "InterviewState"):
+        """
+        Fold in a copy of this tracker written concurrently by another worker.
+        Every field only grows, so the merge keeps both sides' changes: hints and
+        timings are unioned per question, scores and errors keep both sides'
+        appends, and plan progress is taken from whichever copy is further along.
+        """
+        if other.total_questions_asked > self.total_questions_asked:
+            self.current_category_idx = other.current_category_idx
+            self.current_question_in_category = other.current_question_in_category
+            self.total_questions_asked = other.total_questions_asked
+            self.is_complete = other.is_complete
+            self.current_question_text = other.current_question_text
+        
+        for q_index, levels in other.hint_usage.items():
+            used = self.hint_usage.setdefault(q_index, [])
+            used.extend(level for level in levels if level not in used)
+        for q_index, ts in other.question_timestamps.items():
+            mine = self.question_timestamps.get(q_index)
+            if mine is None or (ts.get("answered_at") and not mine.get("answered_at")):
+                self.question_timestamps[q_index] = ts
+        for q_index, topic in other.question_topics.items():
+            self.question_topics.setdefault(q_index, topic)
+        self.asked_topics |= other.asked_topics
+        self.answer_scores = merge_appended(self.answer_scores, other.answer_scores)
+        self.logical_errors = merge_appended(self.logical_errors, other.logical_errors)
+    
+    # --- Serialization (shared session backends) ---
+    
+    def to_dict(self) -> dict:
+        """Compact, JSON-safe snapshot of the tracker."""
+        return {
+            "plan": self.plan,
+            "category_idx": self.current_category_idx,
+            "question_in_category": self.current_question_in_category,
+            "asked": self.total_questions_asked,
+            "asked_topics": sorted(self.asked_topics),
+            "answer_scores": self.answer_scores,
+            "is_complete": self.is_complete,
+            "current_question": self.current_question_text,
+            "hint_usage": self.hint_usage,
+            "question_timestamps": self.question_timestamps,
+            "logical_errors": self.logical_errors,
+            "question_topics": self.question_topics
+        }
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> "InterviewState":
+        """Rebuild a tracker from `to_dict` output (JSON turns int keys into strings)."""
+        state = cls(data["plan"])
+        state.current_category_idx = data["category_idx"]
+        state.current_question_in_category = data["question_in_category"]
+        state.total_questions_asked = data["asked"]
+        state.asked_topics = set(data.get("asked_topics", []))
+        state.answer_scores = data.get("answer_scores", [])
+        state.is_complete = data.get("is_complete", False)
+        state.current_question_text = data.get("current_question", "")
+        state.hint_usage = {int(k): v for k, v in data.get("hint_usage", {}).items()}
+        state.question_timestamps = {int(k): v for k, v in data.get("question_timestamps", {}).items()}
+        state.logical_errors = data.get("logical_errors", [])
+        state.question_topics = {int(k): v for k, v in data.get("question_topics", {}).items()}
+        return state
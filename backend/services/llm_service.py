@@ -7,20 +7,12 @@ load_dotenv()
 client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
 
-async def get_ai_response(candidate_summary: str, job_desc: str, chat_history: list, 
-                          interview_context: str = "", difficulty: str = "medium", topic: str = "") -> str:
-    """
-    Generate the next interview question based on the structured plan.
-    
-    Args:
-        candidate_summary: Compact profile summary (or empty string for topic mode)
-        job_desc: Job description (or empty string for topic mode)
-        chat_history: Conversation history
-        interview_context: Current step info from InterviewState
-        difficulty: easy/medium/hard
-        topic: Specific technical topic (if in topic mode)
-    """
-    
+INTERVIEWER_FALLBACK = "I'm the AI Interviewer. Please configure your OPENAI_API_KEY in the backend/.env file to enable my intelligence! For now, let's pretend I asked you a question about your resume."
+
+
+def _build_interviewer_messages(candidate_summary: str, job_desc: str, chat_history: list,
+                                interview_context: str, difficulty: str, topic: str) -> list:
+    """Build the system prompt + history shared by the blocking and streaming interviewer calls."""
     # Mode-switching logic
     if topic and not candidate_summary:
         # Topic Mode Prompt
@@ -67,7 +59,24 @@ BEHAVIOR RULES:
 - Transition naturally between questions — briefly acknowledge the previous answer before asking the next question.
 - Sound like a real human interviewer, not a question-reading bot."""
 
-    messages = [{"role": "system", "content": system_prompt}] + chat_history
+    return [{"role": "system", "content": system_prompt}] + chat_history
+
+
+async def get_ai_response(candidate_summary: str, job_desc: str, chat_history: list, 
+                          interview_context: str = "", difficulty: str = "medium", topic: str = "") -> str:
+    """
+    Generate the next interview question based on the structured plan.
+    
+    Args:
+        candidate_summary: Compact profile summary (or empty string for topic mode)
+        job_desc: Job description (or empty string for topic mode)
+        chat_history: Conversation history
+        interview_context: Current step info from InterviewState
+        difficulty: easy/medium/hard
+        topic: Specific technical topic (if in topic mode)
+    """
+    messages = _build_interviewer_messages(candidate_summary, job_desc, chat_history,
+                                           interview_context, difficulty, topic)
     
     try:
         response = await client.chat.completions.create(
@@ -79,7 +88,40 @@ BEHAVIOR RULES:
         return response.choices[0].message.content
     except Exception as e:
         print(f"OpenAI Error: {e}")
-        return "I'm the AI Interviewer. Please configure your OPENAI_API_KEY in the backend/.env file to enable my intelligence! For now, let's pretend I asked you a question about your resume."
+        return INTERVIEWER_FALLBACK
+
+
+async def stream_ai_response(candidate_summary: str, job_desc: str, chat_history: list,
+                             interview_context: str = "", difficulty: str = "medium", topic: str = ""):
+    """
+    Streaming variant of `get_ai_response`: yields text deltas as the model produces them.
+    
+    Same prompt and arguments. If the request fails before any token arrives,
+    the fallback reply is yielded as a single delta so callers always get text.
+    """
+    messages = _build_interviewer_messages(candidate_summary, job_desc, chat_history,
+                                           interview_context, difficulty, topic)
+    
+    produced = False
+    try:
+        stream = await client.chat.completions.create(
+            model="gpt-3.5-turbo",
+            messages=messages,
+            max_tokens=250,
+            timeout=15.0,
+            stream=True
+        )
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                produced = True
+                yield delta
+    except Exception as e:
+        print(f"OpenAI Error (stream): {e}")
+        if not produced:
+            yield INTERVIEWER_FALLBACK
 
 
 async def evaluate_answer(question: str, answer: str, category: str, topic: str,
@@ -126,19 +168,20 @@ No explanation, no markdown, just the JSON object."""
                 raw = raw[:-3]
             raw = raw.strip()
         
-        scores = json.loads(raw)
-        
-        # Validate and clamp scores
-        for key in ["accuracy", "depth", "clarity"]:
-            scores[key] = max(1, min(10, int(scores.get(key, 5))))
-        
-        return scores
+        return clamp_scores(json.loads(raw))
         
     except Exception as e:
         print(f"Answer evaluation error: {e}")
         return {"accuracy": 5, "depth": 5, "clarity": 5}
 
 
+def clamp_scores(scores: dict) -> dict:
+    """Validate and clamp accuracy/depth/clarity to 1-10 (missing ones score 5)."""
+    for key in ["accuracy", "depth", "clarity"]:
+        scores[key] = max(1, min(10, int(scores.get(key, 5))))
+    return scores
+
+
 async def get_hint(question, resume_text, job_desc, level="medium", topic="General"):
     """
     Generate accurate, resume-grounded hints using gpt-4o-mini.
@@ -6,6 +6,8 @@ from dotenv import load_dotenv
 load_dotenv()
 client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
+NO_LOGIC_ISSUE = {"has_issue": False, "issue_type": "none", "feedback": "", "severity": "info"}
+
 
 async def validate_logic(question: str, answer: str, topic: str, 
                           chat_history: list = None) -> dict:
@@ -27,10 +29,7 @@ async def validate_logic(question: str, answer: str, topic: str,
         }
     """
     # Build context from recent chat history
-    context = ""
-    if chat_history:
-        recent = chat_history[-6:]  # Last 3 exchanges
-        context = "\n".join(f"{m['role']}: {m['content']}" for m in recent)
+    context = recent_context(chat_history)
     
     validation_prompt = f"""You are a technical interview logic validator. Analyze the candidate's answer for logical errors.
 
@@ -78,25 +77,24 @@ Return ONLY valid JSON, no explanation."""
                 raw = raw[:-3]
             raw = raw.strip()
         
-        result = json.loads(raw)
-        
-        # Validate structure
-        result.setdefault("has_issue", False)
-        result.setdefault("issue_type", "none")
-        result.setdefault("feedback", "")
-        result.setdefault("severity", "info")
-        
-        # Validate severity
-        if result["severity"] not in ("info", "warning", "error"):
-            result["severity"] = "warning"
-        
-        return result
+        return normalize_logic_result(json.loads(raw))
         
     except Exception as e:
         print(f"Logic validation error: {e}")
-        return {
-            "has_issue": False,
-            "issue_type": "none",
-            "feedback": "",
-            "severity": "info"
-        }
+        return dict(NO_LOGIC_ISSUE)
+
+
+def normalize_logic_result(result: dict) -> dict:
+    """Fill in missing fields and coerce an unknown severity to "warning"."""
+    for key, value in NO_LOGIC_ISSUE.items():
+        result.setdefault(key, value)
+    if result["severity"] not in ("info", "warning", "error"):
+        result["severity"] = "warning"
+    return result
+
+
+def recent_context(chat_history: list | None) -> str:
+    """Last 3 exchanges as "role: content" lines for validation prompts."""
+    if not chat_history:
+        return ""
+    return "\n".join(f"{m['role']}: {m['content']}" for m in chat_history[-6:])
@@ -1,8 +1,10 @@
 from models.interview_schema import (
     InterviewReport, QuestionAnswer, VisionMetrics, NLPMetrics, EmotionData
 )
+from services.video_metrics import VIDEO_METRICS_EXPORT_POINTS, as_metrics_store
 from datetime import datetime
 from typing import Dict, Any, List
+import numpy as np
 
 def generate_report(session_data: Dict[str, Any], user_id: str) -> InterviewReport:
     """
@@ -10,44 +12,29 @@ def generate_report(session_data: Dict[str, Any], user_id: str) -> InterviewRepo
     """
     state = session_data.get("interview_state")
     transcript = session_data.get("transcript", [])
-    video_metrics = session_data.get("video_metrics", [])
+    video_metrics = as_metrics_store(session_data.get("video_metrics"))
     answer_scores = session_data.get("answer_scores", [])
     
-    # 1. Process Vision Metrics
-    emotions_list = []
-    eye_contact_sum = 0
-    steadiness_sum = 0
-    count = len(video_metrics)
+    # 1. Process Vision Metrics (column views, no per-frame dicts)
+    # Timelines are downsampled before they reach the stored report
+    timeline = video_metrics.downsampled(VIDEO_METRICS_EXPORT_POINTS)
+    emotion_values = video_metrics.column("emotion")
     
-    emotion_counts = {}
+    # Emotion is the 0-100 score from video_service, reported as a string
+    emotions_list = [
+        EmotionData(timestamp=t, emotion=str(int(round(e))), confidence=c)
+        for t, e, c in zip(timeline["timestamp"], timeline["emotion"], timeline["confidence"])
+    ]
     
-    for m in video_metrics:
-        # Map emotion index to string (assuming 0-6 mapping from video_service or similar)
-        # For now, we use a placeholder or the raw value if it's already a string
-        # Looking at video_service.py might clarify, but let's assume it returns an int or string.
-        # In main.py video_websocket: result["emotion"] is stored.
-        # Let's assume it's a string or mapped int.
-        # If it's an int, we should map it. But let's assume it's handled.
-        emotion = str(m["emotion"]) 
-        emotion_counts[emotion] = emotion_counts.get(emotion, 0) + 1
-        
-        emotions_list.append(EmotionData(
-            timestamp=m["timestamp"],
-            emotion=emotion,
-            confidence=m["confidence"]
-        ))
-        eye_contact_sum += m["focus"]
-        # "confidence" in video metrics is used as steadiness/confidence score
-        steadiness_sum += m["confidence"]
-
-    avg_eye_contact = eye_contact_sum / count if count > 0 else 0
-    avg_steadiness = steadiness_sum / count if count > 0 else 0
-    most_common_emotion = max(emotion_counts, key=emotion_counts.get) if emotion_counts else "Unknown"
+    avg_eye_contact = video_metrics.mean("focus")
+    # "confidence" in video metrics is used as steadiness/confidence score
+    avg_steadiness = video_metrics.mean("confidence")
+    most_common_emotion = str(int(np.bincount(emotion_values).argmax())) if len(video_metrics) else "Unknown"
 
     vision_metrics_obj = VisionMetrics(
         eye_contact_percentage=avg_eye_contact,
         steadiness_score=avg_steadiness,
-        emotions=emotions_list,  # Might need to sample this if too large
+        emotions=emotions_list,  # Downsampled to VIDEO_METRICS_EXPORT_POINTS
         average_emotion=most_common_emotion
     )
     
@@ -117,7 +104,7 @@ def generate_report(session_data: Dict[str, Any], user_id: str) -> InterviewRepo
         confidence_timeline=[], 
         emotion_timeline=[],
         transcript=[{"role": t["role"], "content": t["content"]} for t in transcript],
-        video_metrics=video_metrics, # Store raw metrics for charts
+        video_metrics=video_metrics.to_records(VIDEO_METRICS_EXPORT_POINTS), # Downsampled metrics for charts
         strengths=session_data.get("feedback", {}).get("strengths", []),
         areas_for_improvement=session_data.get("feedback", {}).get("improvements", []),
         overall_feedback="Generated automatically.",
@@ -0,0 +1,133 @@
+"""
+Session Analytics
+
+Builds the /api/analytics payload from running aggregates, so a poll costs
+the same at minute 1 and minute 45:
+- Video: overall sums kept by VideoMetricsStore as frames arrive; per-question
+  windows cut from its timestamp index with binary search
+- Transcript: TranscriptStats folds in only the turns added since its last update
+- build_analytics_response() only assembles those aggregates
+"""
+
+from services.video_metrics import VideoMetricsStore
+
+FILLER_WORDS = ["um", "uh", "like", "you know", "basically", "actually", "literally"]
+POSITIVE_WORDS = ["good", "great", "excellent", "love", "happy", "excited", "confident"]
+NEGATIVE_WORDS = ["bad", "difficult", "hard", "nervous", "worried", "afraid", "confused"]
+
+
+class TranscriptStats:
+    """Filler, word, sentiment and turn counters over a growing transcript."""
+
+    def __init__(self):
+        self.processed = 0  # Transcript entries already folded in
+        self.user_messages = 0
+        self.ai_messages = 0
+        self.total_words = 0
+        self.total_fillers = 0
+        self.filler_counts = {filler: 0 for filler in FILLER_WORDS}
+        self.sentiment_trend = []
+
+    def update(self, transcript: list):
+        if len(transcript) < self.processed:
+            # Transcript was replaced (new interview on the same session): start over
+            self.__init__()
+        for entry in transcript[self.processed:]:
+            if entry["role"] == "user":
+                self._add_user_turn(entry["content"])
+            elif entry["role"] == "ai":
+                self.ai_messages += 1
+        self.processed = len(transcript)
+
+    def _add_user_turn(self, content: str):
+        self.user_messages += 1
+        text = content.lower()
+        self.total_words += len(text.split())
+
+        # Basic sentiment: positive words = +, negative words = -
+        pos_count = sum(1 for w in POSITIVE_WORDS if w in text)
+        neg_count = sum(1 for w in NEGATIVE_WORDS if w in text)
+        self.sentiment_trend.append((pos_count - neg_count) / max(1, pos_count + neg_count + 1))
+
+        for filler in FILLER_WORDS:
+            count = text.count(filler)
+            self.total_fillers += count
+            self.filler_counts[filler] += count
+
+    @classmethod
+    def from_transcript(cls, transcript: list) -> "TranscriptStats":
+        stats = cls()
+        stats.update(transcript)
+        return stats
+
+
+def build_analytics_response(metrics: VideoMetricsStore, stats: TranscriptStats,
+                             scores_summary: dict | None = None, feedback: dict | None = None,
+                             question_timestamps: dict | None = None) -> dict:
+    """
+    Assemble the analytics payload from running aggregates.
+    `question_timestamps` is InterviewState.question_timestamps; with it, per-question
+    vision metrics cover exactly the time each question was open.
+    """
+    avg_focus = metrics.mean("focus")
+    avg_emotion = metrics.mean("emotion")
+    avg_confidence = metrics.mean("confidence")
+    avg_stress = metrics.mean("stress", default=50)
+
+    # Per-question eye contact/confidence over each question's asked..answered window;
+    # stored reports have no question timings, so fall back to ~5 equal-count segments
+    if question_timestamps:
+        per_question_metrics = [
+            {"question_index": q + 1, "eye_contact_percentage": focus, "confidence": confidence, "frames": count}
+            for q, count, focus, confidence in metrics.question_windows(question_timestamps)
+        ]
+    else:
+        per_question_metrics = [
+            {"question_index": i + 1, "eye_contact_percentage": focus, "confidence": confidence}
+            for i, (focus, confidence) in enumerate(metrics.segment_means())
+        ]
+
+    most_common_fillers = []
+    if stats.user_messages:
+        most_common_fillers = sorted(stats.filler_counts.items(), key=lambda x: x[1], reverse=True)[:5]
+    filler_rate = (stats.total_fillers / max(1, stats.total_words)) * 100
+    talk_ratio = stats.user_messages / max(1, stats.ai_messages)
+
+    # Use answer evaluation to enhance technical_accuracy if available
+    if scores_summary and scores_summary.get("total_questions", 0) > 0:
+        # Scale LLM-evaluated accuracy (1-10) to 0-100 for the radar chart
+        technical_accuracy = scores_summary["overall_accuracy"] * 10
+        communication_score = scores_summary["overall_clarity"] * 10
+    else:
+        technical_accuracy = min(100, avg_confidence + 15)
+        communication_score = min(100, avg_emotion + 20)
+
+    response = {
+        "radar_chart_data": {
+            "technical_accuracy": technical_accuracy,
+            "communication": communication_score,
+            "confidence": avg_confidence,
+            "focus": avg_focus,
+            "emotional_intelligence": avg_emotion
+        },
+        "vision_analytics": {
+            "overall_eye_contact_percentage": avg_focus,
+            "overall_steadiness_percentage": 100 - avg_stress,
+            "per_question_metrics": per_question_metrics
+        },
+        "nlp_report": {
+            "total_filler_count": stats.total_fillers,
+            "filler_rate": filler_rate,
+            "talk_to_listen_ratio": talk_ratio,
+            "most_common_fillers": most_common_fillers,
+            "sentiment_trend": stats.sentiment_trend
+        },
+        "scoring_summary": {
+            "average_score": (avg_focus + avg_emotion + avg_confidence) / 3,
+            "scores_over_time": metrics.tail("confidence", 10)
+        },
+        "answer_evaluation": scores_summary
+    }
+    if feedback is not None:
+        response = {"feedback": feedback, **response}
+    return response
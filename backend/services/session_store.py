@@ -0,0 +1,530 @@
+"""
+Session Registry
+
+Holds the per-candidate interview state that used to live in a single
+module-level `session_data` dict in main.py:
+- One session per interview, keyed by an opaque session id
+- Per-session asyncio locks for read-modify-write sections
+- TTL eviction of idle sessions and a bounded memory budget
+- Pluggable persistence: in-process, or SQLite (WAL) shared by all
+  gunicorn workers on the host, with optimistic versioning
+- Concurrent writes to the same session are merged, not overwritten:
+  InterviewState and append-only lists keep both workers' changes
+- Video metrics live in their own column with their own version, so the
+  periodic metrics flush never makes other workers re-read the session
+"""
+
+import asyncio
+import json
+import os
+import secrets
+import sqlite3
+import threading
+import time
+import zlib
+from collections import Counter, OrderedDict
+
+from services.interview_state import InterviewState, merge_appended
+from services.video_metrics import VideoMetricsStore, as_metrics_store
+
+# Rough per-entry sizes used by the memory budget estimate
+TRANSCRIPT_ENTRY_BYTES = 200  # Dict overhead on top of the text itself
+BASE_SESSION_BYTES = 4096     # Profile, plan, InterviewState
+
+# Retries when a shared-backend write races another worker
+MAX_COMMIT_RETRIES = 5
+
+# Session-level lists that workers only ever append to
+APPEND_ONLY_FIELDS = ("answer_scores",)
+
+
+def new_session_data() -> dict:
+    """Return an empty session dict with the layout the endpoints expect."""
+    return {
+        "resume_text": "",           # Raw text (kept for hints)
+        "job_description": "",
+        "candidate_profile": None,   # Structured profile from resume_analyzer
+        "candidate_summary": "",     # Compact summary for LLM prompts
+        "interview_plan": None,      # Fixed plan from interview_planner
+        "interview_state": None,     # InterviewState tracker instance
+        "transcript": [],            # Stores {"role": "user"|"ai", "content": "..."}
+        "video_metrics": VideoMetricsStore(),  # Columnar timestamp/focus/emotion/confidence/stress
+        "answer_scores": [],         # Stores per-answer evaluation scores
+        "pending_evaluations": []    # Question indices still being scored (see drain_evaluations)
+    }
+
+
+def estimate_session_bytes(data: dict) -> int:
+    """Cheap upper-bound estimate of how much memory a session holds."""
+    size = BASE_SESSION_BYTES
+    size += len(data.get("resume_text") or "") + len(data.get("job_description") or "")
+    size += len(data.get("candidate_summary") or "")
+    for entry in data.get("transcript", []):
+        size += TRANSCRIPT_ENTRY_BYTES + len(entry.get("content", ""))
+    metrics = data.get("video_metrics")
+    size += metrics.nbytes if isinstance(metrics, VideoMetricsStore) else 0
+    return size
+
+
+# --- Serialization ---
+
+def serialize_session(data: dict) -> bytes:
+    """
+    Encode a session dict for a shared backend.
+    InterviewState is flattened, then zlib'd. Video metrics are left out:
+    they are written separately, and only when they changed.
+    """
+    payload = {key: value for key, value in data.items() if key != "video_metrics"}
+    state = payload.get("interview_state")
+    payload["interview_state"] = state.to_dict() if state else None
+    raw = json.dumps(payload, separators=(",", ":"), default=str).encode("utf-8")
+    return zlib.compress(raw, 3)
+
+
+def deserialize_session(blob: bytes) -> dict:
+    payload = json.loads(zlib.decompress(blob))
+    state = payload.get("interview_state")
+    payload["interview_state"] = InterviewState.from_dict(state) if state else None
+    if "video_metrics" in payload:
+        # Rows written before metrics had their own column
+        payload["video_metrics"] = VideoMetricsStore.from_dict(payload["video_metrics"] or {})
+    return payload
+
+
+def serialize_metrics(metrics) -> bytes:
+    """Column-wise video metrics (one list per field instead of one dict per frame), zlib'd."""
+    raw = json.dumps(as_metrics_store(metrics).to_dict(), separators=(",", ":")).encode("utf-8")
+    return zlib.compress(raw, 3)
+
+
+def deserialize_metrics(blob: bytes) -> VideoMetricsStore:
+    return VideoMetricsStore.from_dict(json.loads(zlib.decompress(blob)))
+
+
+def merge_session_field(key: str, local, remote):
+    """Combine this worker's dirty copy of a field with another worker's newer one."""
+    if key == "interview_state" and isinstance(local, InterviewState) and isinstance(remote, InterviewState):
+        local.merge(remote)
+        return local
+    if key in APPEND_ONLY_FIELDS and isinstance(local, list) and isinstance(remote, list):
+        return merge_appended(local, remote)
+    return local  # Single-writer fields: the local copy is the newest
+
+
+class SessionConflictError(Exception):
+    """Raised when a versioned write loses a race with another writer."""
+
+
+# --- Backends ---
+
+class InMemorySessionBackend:
+    """
+    Process-local backend. Records are the live session dicts themselves,
+    so reads never copy and writes only bump the version.
+    """
+
+    shared = False
+
+    def __init__(self):
+        self._records = {}  # {session_id: (version, data, metrics version)}
+
+    def insert(self, session_id: str, data: dict) -> int:
+        self._records[session_id] = (1, data, 1)
+        return 1
+
+    def load(self, session_id: str, known_version: int = 0, known_metrics_version: int = 0):
+        """
+        Return (version, data, metrics version, metrics), data None if unchanged, or
+        None if missing. Metrics are always None: they live in the data dict.
+        """
+        record = self._records.get(session_id)
+        if record is None:
+            return None
+        version, data, metrics_version = record
+        return (version, None if version == known_version else data, metrics_version, None)
+
+    def save(self, session_id: str, data: dict, expected_version: int) -> int:
+        version, _, metrics_version = self._records.get(session_id, (expected_version, None, 1))
+        if version != expected_version:
+            raise SessionConflictError(session_id)
+        self._records[session_id] = (version + 1, data, metrics_version)
+        return version + 1
+
+    def save_metrics(self, session_id: str, metrics) -> int:
+        record = self._records.get(session_id)
+        if record is None:
+            raise SessionConflictError(session_id)
+        version, data, metrics_version = record
+        self._records[session_id] = (version, data, metrics_version + 1)
+        return metrics_version + 1
+
+    def delete(self, session_id: str):
+        self._records.pop(session_id, None)
+
+    def sweep(self, ttl_seconds: float):
+        pass  # The local cache owns expiry for in-process sessions
+
+
+class SQLiteSessionBackend:
+    """
+    Shared backend for multiple workers on one host.
+    One row per session; WAL mode lets readers proceed while a worker writes,
+    and the version column turns every write into a compare-and-swap.
+    """
+
+    shared = True
+
+    def __init__(self, path: str = "sessions.db"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=5.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS sessions (
+                id TEXT PRIMARY KEY,
+                version INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                data BLOB NOT NULL,
+                metrics BLOB,
+                metrics_version INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(sessions)")}
+        if "metrics" not in columns:
+            # Databases from before metrics had their own column
+            self._conn.execute("ALTER TABLE sessions ADD COLUMN metrics BLOB")
+            self._conn.execute("ALTER TABLE sessions ADD COLUMN metrics_version INTEGER NOT NULL DEFAULT 0")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS sessions_updated_at ON sessions(updated_at)")
+
+    def insert(self, session_id: str, data: dict) -> int:
+        blob = serialize_session(data)
+        metrics = serialize_metrics(data.get("video_metrics"))
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO sessions (id, version, created_at, updated_at, data, metrics, metrics_version) "
+                "VALUES (?, 1, ?, ?, ?, ?, 1)",
+                (session_id, now, now, blob, metrics)
+            )
+        return 1
+
+    def load(self, session_id: str, known_version: int = 0, known_metrics_version: int = 0):
+        """
+        Return (version, data, metrics version, metrics), or None if missing. data is
+        None when `known_version` is current, metrics when `known_metrics_version` is.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT version, CASE WHEN version = ? THEN NULL ELSE data END, metrics_version, "
+                "CASE WHEN metrics_version = ? THEN NULL ELSE metrics END FROM sessions WHERE id = ?",
+                (known_version, known_metrics_version, session_id)
+            ).fetchone()
+        if row is None:
+            return None
+        version, blob, metrics_version, metrics = row
+        data = deserialize_session(blob) if blob is not None else None
+        metrics = deserialize_metrics(metrics) if metrics is not None else None
+        return (version, data, metrics_version, metrics)
+
+    def save(self, session_id: str, data: dict, expected_version: int) -> int:
+        """Compare-and-swap write of everything but the video metrics."""
+        blob = serialize_session(data)
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE sessions SET version = version + 1, updated_at = ?, data = ? WHERE id = ? AND version = ?",
+                (now, blob, session_id, expected_version)
+            )
+        if cursor.rowcount != 1:
+            raise SessionConflictError(session_id)
+        return expected_version + 1
+
+    def save_metrics(self, session_id: str, metrics) -> int:
+        """
+        Overwrite the video metrics and return their new version. Leaves the session
+        version alone, so readers that only need `data` aren't sent it again.
+        Unconditional: a session's metrics have a single writer, its video socket.
+        """
+        blob = serialize_metrics(metrics)
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE sessions SET metrics = ?, metrics_version = metrics_version + 1, updated_at = ? WHERE id = ?",
+                (blob, time.time(), session_id)
+            )
+            if cursor.rowcount != 1:
+                raise SessionConflictError(session_id)
+            (metrics_version,) = self._conn.execute(
+                "SELECT metrics_version FROM sessions WHERE id = ?", (session_id,)
+            ).fetchone()
+        return metrics_version
+
+    def delete(self, session_id: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+
+    def sweep(self, ttl_seconds: float):
+        with self._lock:
+            self._conn.execute("DELETE FROM sessions WHERE updated_at < ?", (time.time() - ttl_seconds,))
+
+
+# --- Registry ---
+
+class Session:
+    """A single interview session: its data dict plus bookkeeping."""
+
+    __slots__ = ("session_id", "data", "version", "metrics_version", "dirty", "held", "lock",
+                 "created_at", "last_access", "connections", "cache")
+
+    def __init__(self, session_id: str, data: dict, version: int = 1, metrics_version: int = 1):
+        self.session_id = session_id
+        self.data = data
+        self.version = version
+        self.metrics_version = metrics_version  # Version of the stored video_metrics (0: never written)
+        self.dirty = set()  # Fields changed locally since the last commit
+        self.held = Counter()  # Fields an unfinished writer is still changing (see hold)
+        self.lock = asyncio.Lock()
+        self.created_at = time.time()
+        self.last_access = self.created_at
+        self.connections = 0  # Open websockets; pinned sessions are never evicted
+        self.cache = {}  # Per-process derived data (analytics aggregates); never persisted
+
+    def touch(self):
+        self.last_access = time.time()
+
+    def mark_dirty(self, *fields: str):
+        """Protect locally-modified fields from being overwritten by `refresh`."""
+        self.dirty.update(fields)
+
+    def hold(self, *fields: str):
+        """
+        Mark fields dirty for a writer that changes them across several awaits.
+        They stay dirty through other writers' commits until `release`, so a
+        commit in between can't expose them to being replaced by `refresh`.
+        """
+        self.mark_dirty(*fields)
+        self.held.update(fields)
+
+    def release(self, *fields: str):
+        self.held -= Counter(fields)
+
+
+class SessionStore:
+    """
+    Registry of interview sessions backed by a pluggable backend.
+
+    Sessions are cached locally in least-recently-used order so both TTL
+    eviction and the memory budget only look at the oldest entries.
+    Sessions with an open websocket are pinned and skipped by eviction.
+
+    With a shared backend the hot path is one `refresh` (a version check that
+    only transfers data if another worker wrote) and one `commit` per turn.
+    A commit that loses a race reloads the other worker's fields, keeps the
+    ones this worker marked dirty, and retries.
+    """
+
+    def __init__(self, backend=None, ttl_seconds: float = 3600, max_sessions: int = 500,
+                 max_bytes: int = 256 * 1024 * 1024):
+        self.backend = backend or InMemorySessionBackend()
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self._sessions: "OrderedDict[str, Session]" = OrderedDict()
+        self._latest_id = None  # Newest session: spared by eviction until its websocket connects
+        self.evicted_count = 0
+        self.conflict_count = 0
+
+    def __len__(self):
+        return len(self._sessions)
+
+    async def _call(self, fn, *args):
+        """Run backend I/O off the event loop when it touches disk."""
+        if self.backend.shared:
+            return await asyncio.to_thread(fn, *args)
+        return fn(*args)
+
+    async def create(self, data: dict | None = None) -> Session:
+        """Register a new session and return it."""
+        await self.sweep()
+        session_id = secrets.token_urlsafe(16)
+        data = data if data is not None else new_session_data()
+        version = await self._call(self.backend.insert, session_id, data)
+        session = Session(session_id, data, version)
+        self._sessions[session_id] = session
+        self._latest_id = session_id
+        self._enforce_budget()
+        return session
+
+    async def get(self, session_id: str) -> Session | None:
+        """Look up a session, refreshing its idle timer and any remote changes."""
+        session = self._sessions.get(session_id)
+        if session is not None and self._is_expired(session):
+            self._evict(session_id)
+            session = None
+        if session is None:
+            if not self.backend.shared:
+                return None
+            record = await self._call(self.backend.load, session_id, 0, 0)
+            if record is None:
+                return None
+            version, data, metrics_version, metrics = record
+            if metrics is not None:
+                data["video_metrics"] = metrics
+            session = Session(session_id, data, version, metrics_version)
+            self._sessions[session_id] = session
+            self._enforce_budget()
+        else:
+            await self.refresh(session)
+        session.touch()
+        self._sessions.move_to_end(session_id)
+        return session
+
+    async def resolve(self, session_id: str | None) -> Session | None:
+        """
+        Look up the session a request names. Requests without a session id get
+        None: falling back to "the latest session" let concurrent candidates
+        share one another's interview.
+        """
+        if not session_id:
+            return None
+        return await self.get(session_id)
+
+    async def refresh(self, session: Session):
+        """
+        Pull fields written by other workers. Locally dirty fields are merged with
+        the fresh copy (see merge_session_field) rather than replaced, and so is
+        the InterviewState even when clean: handlers keep a reference to it
+        across awaits, so it must stay the same object.
+        """
+        if not self.backend.shared:
+            return
+        record = await self._call(self.backend.load, session.session_id, session.version, session.metrics_version)
+        if record is None:
+            return
+        version, fresh, metrics_version, metrics = record
+        if fresh is not None:
+            for key, value in fresh.items():
+                local = session.data.get(key)
+                if key in session.dirty or (key == "interview_state" and isinstance(local, InterviewState)):
+                    session.data[key] = merge_session_field(key, local, value)
+                else:
+                    session.data[key] = value
+            session.version = version
+        if metrics is not None and "video_metrics" not in session.dirty:
+            session.data["video_metrics"] = metrics
+        session.metrics_version = metrics_version
+
+    async def commit(self, session: Session, *fields: str):
+        """
+        Persist the session with a compare-and-swap on its version.
+        `fields` are the keys this writer changed. On conflict the other worker's
+        write is merged in and the save retried, so neither side's changes are lost.
+        """
+        session.mark_dirty(*fields)
+        for _ in range(MAX_COMMIT_RETRIES):
+            written = set(session.dirty)
+            # Rows from before the metrics column carry none until first written
+            write_metrics = "video_metrics" in written or not session.metrics_version
+            try:
+                if written - {"video_metrics"}:
+                    session.version = await self._call(
+                        self.backend.save, session.session_id, session.data, session.version
+                    )
+                if write_metrics:
+                    session.metrics_version = await self._call(
+                        self.backend.save_metrics, session.session_id, session.data.get("video_metrics")
+                    )
+                # Fields dirtied while the save was in flight, or held by another writer, stay dirty
+                session.dirty -= written - session.held.keys()
+                return
+            except SessionConflictError:
+                self.conflict_count += 1
+                await self.refresh(session)
+        raise SessionConflictError(session.session_id)
+
+    def delete(self, session_id: str):
+        self._sessions.pop(session_id, None)
+        self.backend.delete(session_id)
+        if self._latest_id == session_id:
+            self._latest_id = None
+
+    def connect(self, session: Session):
+        """Pin a session while a websocket is attached to it."""
+        session.connections += 1
+        session.touch()
+
+    def disconnect(self, session: Session):
+        session.connections = max(0, session.connections - 1)
+        session.touch()
+
+    # --- Eviction ---
+
+    def _is_expired(self, session: Session, now: float | None = None) -> bool:
+        if session.connections > 0:
+            return False
+        now = now if now is not None else time.time()
+        return now - session.last_access > self.ttl_seconds
+
+    def _evict(self, session_id: str):
+        """Drop a session from the local cache; shared backends keep the row until its TTL."""
+        self._sessions.pop(session_id, None)
+        if not self.backend.shared:
+            self.backend.delete(session_id)
+        if self._latest_id == session_id:
+            self._latest_id = None
+        self.evicted_count += 1
+        print(f"[Session Store] Evicted session {session_id[:8]}")
+
+    async def sweep(self):
+        """Drop sessions that have been idle for longer than the TTL."""
+        now = time.time()
+        for session_id, session in list(self._sessions.items()):
+            if session.last_access + self.ttl_seconds > now:
+                break  # LRU order: everything after this is fresher
+            if self._is_expired(session, now):
+                self._evict(session_id)
+        await self._call(self.backend.sweep, self.ttl_seconds)
+
+    def total_bytes(self) -> int:
+        return sum(estimate_session_bytes(s.data) for s in self._sessions.values())
+
+    def _enforce_budget(self):
+        """Evict least-recently-used idle sessions until under both limits."""
+        total = self.total_bytes()
+        for session_id, session in list(self._sessions.items()):
+            if len(self._sessions) <= self.max_sessions and total <= self.max_bytes:
+                return
+            if session.connections > 0 or session_id == self._latest_id:
+                continue
+            total -= estimate_session_bytes(session.data)
+            self._evict(session_id)
+        if len(self._sessions) > self.max_sessions or total > self.max_bytes:
+            print(f"[Session Store] Over budget with {len(self._sessions)} pinned sessions (~{total // 1024} KB)")
+
+    def stats(self) -> dict:
+        return {
+            "backend": type(self.backend).__name__,
+            "sessions": len(self._sessions),
+            "connected": sum(1 for s in self._sessions.values() if s.connections > 0),
+            "approx_bytes": self.total_bytes(),
+            "evicted": self.evicted_count,
+            "write_conflicts": self.conflict_count
+        }
+
+
+def create_session_store() -> SessionStore:
+    """
+    Build the store from environment settings.
+    SESSION_BACKEND=sqlite shares sessions between workers via SESSION_DB_PATH.
+    """
+    if os.getenv("SESSION_BACKEND", "memory").lower() == "sqlite":
+        backend = SQLiteSessionBackend(os.getenv("SESSION_DB_PATH", "sessions.db"))
+    else:
+        backend = InMemorySessionBackend()
+    return SessionStore(
+        backend=backend,
+        ttl_seconds=float(os.getenv("SESSION_TTL_SECONDS", "3600")),
+        max_sessions=int(os.getenv("SESSION_MAX_COUNT", "500")),
+        max_bytes=int(os.getenv("SESSION_MAX_MB", "256")) * 1024 * 1024
+    )
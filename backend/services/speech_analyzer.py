@@ -1,5 +1,6 @@
 def analyze_speech_confidence(text: str, duration_seconds: float, 
-                               silence_duration: float = 0.0) -> dict:
+                               silence_duration: float = 0.0,
+                               voice_activity: dict | None = None) -> dict:
     """
     Analyze speech confidence from transcribed text and timing data.
     
@@ -7,6 +8,8 @@ def analyze_speech_confidence(text: str, duration_seconds: float,
         text: Transcribed text from user's speech
         duration_seconds: Total duration of the audio recording (speaking time)
         silence_duration: Time gap before user started speaking (hesitation)
+        voice_activity: Server-side VAD result for the recording; when given, its
+            voiced span and leading silence replace the two client-reported values
     
     Returns:
         {
@@ -16,9 +19,15 @@ def analyze_speech_confidence(text: str, duration_seconds: float,
             "pace": str,            # "too_slow"|"slow"|"normal"|"fast"|"too_fast"
             "confidence_level": str, # "low"|"medium"|"high"
             "long_silence": bool,    # True if silence > 3 seconds
-            "feedback": str          # Human-readable feedback message
+            "feedback": str,         # Human-readable feedback message
+            "pause_count": int,      # Only with voice_activity
+            "longest_pause": float   # Only with voice_activity
         }
     """
+    if voice_activity:
+        duration_seconds = voice_activity["span_seconds"]
+        silence_duration = voice_activity["leading_silence"]
+    
     words = text.split()
     word_count = len(words)
     
@@ -97,7 +106,7 @@ def analyze_speech_confidence(text: str, duration_seconds: float,
     feedback = _generate_feedback(pace, filler_rate, long_silence, 
                                    silence_duration, confidence_level, wpm)
     
-    return {
+    result = {
         "wpm": round(wpm, 1),
         "filler_rate": round(filler_rate, 1),
         "filler_count": filler_count,
@@ -108,6 +117,10 @@ def analyze_speech_confidence(text: str, duration_seconds: float,
         "silence_duration": round(silence_duration, 1),
         "feedback": feedback
     }
+    if voice_activity:
+        result["pause_count"] = voice_activity["pause_count"]
+        result["longest_pause"] = voice_activity["longest_pause"]
+    return result
 
 
 def _generate_feedback(pace: str, filler_rate: float, long_silence: bool,
@@ -0,0 +1,92 @@
+"""
+Transcription Service
+
+Whisper speech-to-text for candidate answers:
+- Audio is handed to the client as a file object: the upload's own spooled
+  buffer (memory, or a private temp file above Starlette's threshold) or a
+  BytesIO, never a shared path on disk
+- Per-upload size limit and per-request timing
+"""
+
+import io
+import os
+import time
+from openai import AsyncOpenAI
+from dotenv import load_dotenv
+
+load_dotenv()
+client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+WHISPER_MODEL = "whisper-1"
+# Whisper itself rejects files over 25 MB
+TRANSCRIBE_MAX_BYTES = int(float(os.getenv("TRANSCRIBE_MAX_MB", "25")) * 1024 * 1024)
+DEFAULT_AUDIO_NAME = "voice.wav"  # Same name the old temp-file path used
+AUDIO_EXTENSIONS = {"webm", "wav", "ogg", "mp3", "mp4", "m4a", "mpeg", "mpga", "flac"}
+
+
+class AudioTooLargeError(Exception):
+    """Raised when an upload exceeds TRANSCRIBE_MAX_BYTES."""
+
+
+_metrics = {"requests": 0, "rejected": 0, "failed": 0, "audio_bytes": 0, "seconds": 0.0}
+
+
+def check_audio_size(size: int):
+    if size > TRANSCRIBE_MAX_BYTES:
+        _metrics["rejected"] += 1
+        raise AudioTooLargeError(f"Audio is {size} bytes; the limit is {TRANSCRIBE_MAX_BYTES}")
+
+
+def audio_filename(filename: str | None, content_type: str | None = None) -> str:
+    """Name the upload for Whisper, which goes by the extension. Browser blobs arrive as "blob"."""
+    if filename and "." in filename:
+        return filename
+    subtype = (content_type or "").split(";")[0].split("/")[-1].strip()
+    return f"voice.{subtype}" if subtype in AUDIO_EXTENSIONS else DEFAULT_AUDIO_NAME
+
+
+async def transcribe(audio, filename: str | None = None, size: int | None = None) -> str:
+    """
+    Transcribe `audio` (bytes or a binary file object positioned at the start).
+    Returns "" for noise-only results or on failure.
+    """
+    if isinstance(audio, (bytes, bytearray, memoryview)):
+        size = len(audio)
+        audio = io.BytesIO(audio)
+    if size is not None:
+        check_audio_size(size)
+    filename = audio_filename(filename)
+
+    start = time.perf_counter()
+    try:
+        transcript = await client.audio.transcriptions.create(
+            model=WHISPER_MODEL,
+            file=(filename, audio),
+            language="en", # Forces English to stop the Korean hallucinations
+            prompt="Technical interview conversation about software development." # Contextual hint
+        )
+    except Exception as e:
+        _metrics["failed"] += 1
+        print(f"Transcription error: {e}")
+        return ""
+    finally:
+        elapsed = time.perf_counter() - start
+        _metrics["requests"] += 1
+        _metrics["audio_bytes"] += size or 0
+        _metrics["seconds"] += elapsed
+        print(f"[Transcribe] {(size or 0) / 1024:.0f} KB in {elapsed:.2f}s")
+
+    # Filter out "hallucinations" (very short or nonsense noise)
+    text = transcript.text.strip()
+    return text if len(text) >= 2 else ""
+
+
+def get_transcription_metrics() -> dict:
+    requests = _metrics["requests"]
+    return {
+        "requests": requests,
+        "rejected": _metrics["rejected"],
+        "failed": _metrics["failed"],
+        "avg_latency_ms": round(_metrics["seconds"] / requests * 1000, 1) if requests else 0.0,
+        "audio_mb": round(_metrics["audio_bytes"] / (1024 * 1024), 2)
+    }
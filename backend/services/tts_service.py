@@ -1,29 +1,233 @@
 import os
-from openai import OpenAI
+import re
+import time
+import asyncio
+from openai import AsyncOpenAI
 from dotenv import load_dotenv
+from services.audio_cache import AudioCache, audio_cache_key
 
 load_dotenv()
 
-# Use standard OpenAI client for synchronous operations
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# Async client for everything running on the event loop
+async_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
-def generate_audio(text: str):
+TTS_MODEL = "tts-1"
+TTS_VOICE = "alloy"
+
+# Worker pool settings: concurrent synthesis calls per worker process, per-call deadline
+TTS_CONCURRENCY = int(os.getenv("TTS_CONCURRENCY", "8"))
+TTS_TIMEOUT_SECONDS = float(os.getenv("TTS_TIMEOUT_SECONDS", "20"))
+
+# Cache settings: in-memory LRU budget, on-disk directory (empty string disables the disk tier) and its budget
+TTS_CACHE_MEMORY_MB = int(os.getenv("TTS_CACHE_MEMORY_MB", "32"))
+TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR", ".tts_cache")
+TTS_CACHE_DISK_MB = int(os.getenv("TTS_CACHE_DISK_MB", "256"))
+
+# Sentence pipeline settings
+TTS_MAX_PARALLEL = int(os.getenv("TTS_MAX_PARALLEL", "3"))
+MIN_SENTENCE_CHARS = 20  # Merge very short fragments so each TTS call is worth its round trip
+
+_SENTENCE_END = re.compile(r'[.!?]+["\')\]]*\s+|\n+')
+_ABBREVIATIONS = ("e.g.", "i.e.", "etc.", "vs.", "mr.", "mrs.", "ms.", "dr.")
+
+class AsyncTTSPool:
     """
-    Generate audio from text using OpenAI's TTS API.
-    Uses the 'alloy' voice by default, or 'shimmer' if requested.
+    Bounded pool of in-flight TTS requests on the async client.
+    
+    Callers beyond `concurrency` wait in a FIFO queue instead of piling onto
+    the API, each call has its own deadline, and queue depth / latency are
+    tracked so a slow provider shows up in /health rather than as frozen sockets.
     """
-    try:
-        # OpenAI TTS model (tts-1 is faster, tts-1-hd is higher quality)
-        # Voices: alloy, echo, fable, onyx, nova, and shimmer
-        response = client.audio.speech.create(
-            model="tts-1",
-            voice="alloy",
-            input=text
-        )
+    
+    def __init__(self, concurrency: int = TTS_CONCURRENCY, timeout: float = TTS_TIMEOUT_SECONDS):
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self._slots = asyncio.Semaphore(concurrency)
+        self.queued = 0
+        self.in_flight = 0
+        self.max_queue_depth = 0
+        self.completed = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.total_seconds = 0.0
+    
+    async def synthesize(self, text: str, timeout: float | None = None) -> bytes | None:
+        """Return MP3 bytes, or None on error/timeout."""
+        self.queued += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queued)
+        try:
+            await self._slots.acquire()
+        finally:
+            self.queued -= 1
         
-        # Return the binary content directly
-        return response.content
+        self.in_flight += 1
+        start = time.perf_counter()
+        try:
+            response = await asyncio.wait_for(
+                async_client.audio.speech.create(model=TTS_MODEL, voice=TTS_VOICE, input=text),
+                timeout or self.timeout
+            )
+            self.completed += 1
+            return response.content
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            print(f"[TTS] Synthesis timed out after {timeout or self.timeout:.1f}s ({len(text)} chars)")
+            return None
+        except Exception as e:
+            self.failed += 1
+            print(f"Error generating audio with OpenAI: {e}")
+            return None
+        finally:
+            self.total_seconds += time.perf_counter() - start
+            self.in_flight -= 1
+            self._slots.release()
+    
+    def metrics(self) -> dict:
+        calls = self.completed + self.failed + self.timeouts
+        return {
+            "queue_depth": self.queued,
+            "max_queue_depth": self.max_queue_depth,
+            "in_flight": self.in_flight,
+            "concurrency": self.concurrency,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timeouts": self.timeouts,
+            "avg_latency_ms": round(self.total_seconds / calls * 1000, 1) if calls else 0.0
+        }
+
+
+tts_pool = AsyncTTSPool()
+audio_cache = AudioCache(TTS_CACHE_MEMORY_MB * 1024 * 1024, TTS_CACHE_DIR or None, TTS_CACHE_DISK_MB * 1024 * 1024)
+_inflight = {}  # {cache_key: Task} so identical concurrent misses share one synthesis
+
+
+async def generate_audio_async(text: str, timeout: float | None = None):
+    """
+    Synthesize `text` to MP3 bytes for request handlers and websockets.
+    Checks the memory tier, then the disk tier, before paying for a synthesis.
+    """
+    key = audio_cache_key(text, TTS_VOICE, TTS_MODEL)
+    audio = audio_cache.get_memory(key)
+    if audio is not None:
+        audio_cache.record_hit("memory")
+        return audio
+    
+    audio = await asyncio.to_thread(audio_cache.read_disk, key)
+    if audio is not None:
+        audio_cache.record_hit("disk")
+        audio_cache.put_memory(key, audio)
+        return audio
+    
+    task = _inflight.get(key)
+    if task is None:
+        audio_cache.misses += 1
+        task = asyncio.create_task(_synthesize_and_store(key, text, timeout))
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    return await asyncio.shield(task)
+
 
-    except Exception as e:
-        print(f"Error generating audio with OpenAI: {e}")
-        return None
\ No newline at end of file
+async def _synthesize_and_store(key: str, text: str, timeout: float | None):
+    audio = await tts_pool.synthesize(text, timeout)
+    if audio:
+        audio_cache.put_memory(key, audio)
+        await asyncio.to_thread(audio_cache.write_disk, key, audio)
+    return audio
+
+
+async def prewarm_tts_cache(phrases: list):
+    """Synthesize (or load from disk) a list of stock phrases so their first use is a cache hit."""
+    results = await asyncio.gather(*(generate_audio_async(p) for p in phrases if p))
+    print(f"[TTS] Pre-warmed {sum(1 for r in results if r)}/{len(results)} phrases")
+
+
+def get_tts_metrics() -> dict:
+    return {**tts_pool.metrics(), "cache": audio_cache.stats()}
+
+
+class SentenceSplitter:
+    """
+    Incrementally cuts streamed text into speakable sentences.
+    Feed it LLM deltas; it returns every sentence completed so far.
+    """
+    
+    def __init__(self, min_chars: int = MIN_SENTENCE_CHARS):
+        self.min_chars = min_chars
+        self.buffer = ""
+    
+    def feed(self, delta: str) -> list:
+        self.buffer += delta
+        sentences = []
+        start = 0
+        for match in _SENTENCE_END.finditer(self.buffer):
+            candidate = self.buffer[start:match.end()].strip()
+            if len(candidate) < self.min_chars or candidate.lower().endswith(_ABBREVIATIONS):
+                continue  # Keep accumulating into the next boundary
+            sentences.append(candidate)
+            start = match.end()
+        self.buffer = self.buffer[start:]
+        return sentences
+    
+    def flush(self) -> str:
+        """Return whatever is left once the stream ends."""
+        rest, self.buffer = self.buffer.strip(), ""
+        return rest
+
+
+class SentenceAudioPipeline:
+    """
+    Overlaps speech synthesis with LLM generation.
+    
+    Sentences are synthesized concurrently (at most `max_parallel` at once) as
+    soon as they complete, and `send_chunk(seq, text, audio)` is awaited for
+    each one strictly in order, so the client can start playing sentence 0
+    while later sentences are still being generated or synthesized.
+    """
+    
+    def __init__(self, send_chunk, max_parallel: int = TTS_MAX_PARALLEL):
+        self.send_chunk = send_chunk
+        self.splitter = SentenceSplitter()
+        self._semaphore = asyncio.Semaphore(max_parallel)
+        self._queue = asyncio.Queue()
+        self._pending = []
+        self._sender = asyncio.create_task(self._send_in_order())
+        self.chunks_sent = 0
+    
+    def feed(self, delta: str):
+        for sentence in self.splitter.feed(delta):
+            self._submit(sentence)
+    
+    def _submit(self, sentence: str):
+        task = asyncio.create_task(self._synthesize(sentence))
+        self._pending.append(task)
+        self._queue.put_nowait((sentence, task))
+    
+    async def _synthesize(self, sentence: str):
+        async with self._semaphore:
+            return await generate_audio_async(sentence)
+    
+    async def _send_in_order(self):
+        while True:
+            item = await self._queue.get()
+            if item is None:
+                return
+            sentence, task = item
+            audio = await task
+            if audio:
+                await self.send_chunk(self.chunks_sent, sentence, audio)
+                self.chunks_sent += 1
+    
+    async def finish(self) -> int:
+        """Synthesize the trailing fragment, wait for every chunk to be sent, return the count."""
+        rest = self.splitter.flush()
+        if rest:
+            self._submit(rest)
+        self._queue.put_nowait(None)
+        await self._sender
+        return self.chunks_sent
+    
+    def cancel(self):
+        """Abort outstanding synthesis, e.g. when the socket drops mid-turn."""
+        for task in self._pending:
+            task.cancel()
+        self._sender.cancel()
@@ -0,0 +1,237 @@
+"""
+Video Metrics Store
+
+Per-session webcam metrics kept column-wise instead of one dict per frame:
+- float64 timestamps plus uint8 focus/emotion/confidence/stress (all 0-100),
+  about 12 bytes per frame instead of ~400
+- Grows by doubling up to `max_points`, then applies the retention policy:
+  - "compact" (default): average neighbouring pairs in the older half, so the
+    whole interview stays covered at gradually coarser resolution
+  - "window": drop the oldest quarter, keeping only recent history
+- Read-only NumPy views for analytics; records only at the JSON boundary
+- Running totals over every frame ever appended, so overall averages cost
+  O(1) and survive the retention policy
+- Prefix sums of focus/confidence next to the (sorted) timestamps, so the
+  mean over any time window is two binary searches
+- Exports (reports, chart payloads) are cut to VIDEO_METRICS_EXPORT_POINTS
+  fixed-window buckets carrying mean, min and max, so spikes survive
+"""
+
+import os
+
+import numpy as np
+
+VIDEO_METRIC_FIELDS = ("timestamp", "focus", "emotion", "confidence", "stress")
+SCORE_FIELDS = VIDEO_METRIC_FIELDS[1:]
+WINDOW_FIELDS = ("focus", "confidence")  # Fields with prefix sums for window queries
+
+VIDEO_METRICS_MAX_POINTS = int(os.getenv("VIDEO_METRICS_MAX_POINTS", "16384"))
+VIDEO_METRICS_RETENTION = os.getenv("VIDEO_METRICS_RETENTION", "compact")
+VIDEO_METRICS_EXPORT_POINTS = int(os.getenv("VIDEO_METRICS_EXPORT_POINTS", "300"))  # 0 = export every frame
+INITIAL_CAPACITY = 1024
+
+
+class VideoMetricsStore:
+    def __init__(self, max_points: int = VIDEO_METRICS_MAX_POINTS, retention: str = VIDEO_METRICS_RETENTION):
+        self.max_points = max(16, max_points)
+        self.retention = retention
+        capacity = min(INITIAL_CAPACITY, self.max_points)
+        self._timestamps = np.empty(capacity, dtype=np.float64)
+        self._scores = np.empty((len(SCORE_FIELDS), capacity), dtype=np.uint8)
+        # _prefix[:, i] = sum of the first i stored values (uint32: 255 * 16M frames fits)
+        self._prefix = np.zeros((len(WINDOW_FIELDS), capacity + 1), dtype=np.uint32)
+        self._window_rows = [SCORE_FIELDS.index(f) for f in WINDOW_FIELDS]
+        self._size = 0
+        
+        # Running aggregates, untouched by compaction/windowing
+        self.totals = np.zeros(len(SCORE_FIELDS), dtype=np.float64)
+        self.total_count = 0
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def nbytes(self) -> int:
+        return self._timestamps.nbytes + self._scores.nbytes
+
+    def append(self, timestamp: float, focus: float, emotion: float, confidence: float, stress: float):
+        if self._size == len(self._timestamps):
+            self._make_room()
+        i = self._size
+        self._timestamps[i] = timestamp
+        self._scores[:, i] = (focus, emotion, confidence, stress)
+        self._prefix[:, i + 1] = self._prefix[:, i] + self._scores[self._window_rows, i]
+        self._size += 1
+        
+        self.totals += self._scores[:, i]
+        self.total_count += 1
+
+    def _make_room(self):
+        capacity = len(self._timestamps)
+        if capacity < self.max_points:
+            new_capacity = min(capacity * 2, self.max_points)
+            timestamps = np.empty(new_capacity, dtype=np.float64)
+            scores = np.empty((len(SCORE_FIELDS), new_capacity), dtype=np.uint8)
+            prefix = np.zeros((len(WINDOW_FIELDS), new_capacity + 1), dtype=np.uint32)
+            timestamps[:capacity] = self._timestamps
+            scores[:, :capacity] = self._scores
+            prefix[:, :capacity + 1] = self._prefix
+            self._timestamps, self._scores, self._prefix = timestamps, scores, prefix
+            return
+
+        n = self._size
+        if self.retention == "window":
+            drop = n // 4
+            self._timestamps[:n - drop] = self._timestamps[drop:n]
+            self._scores[:, :n - drop] = self._scores[:, drop:n]
+            self._size = n - drop
+            self._rebuild_prefix()
+            return
+
+        # Compact: the older half becomes half as many averaged points
+        half = (n // 2) & ~1
+        pairs = half // 2
+        self._timestamps[:pairs] = self._timestamps[:half].reshape(pairs, 2).mean(axis=1)
+        averaged = self._scores[:, :half].reshape(len(SCORE_FIELDS), pairs, 2).mean(axis=2)
+        self._scores[:, :pairs] = np.rint(averaged).astype(np.uint8)
+        self._timestamps[pairs:n - pairs] = self._timestamps[half:n]
+        self._scores[:, pairs:n - pairs] = self._scores[:, half:n]
+        self._size = n - pairs
+        self._rebuild_prefix()
+
+    def _rebuild_prefix(self):
+        n = self._size
+        np.cumsum(self._scores[self._window_rows, :n], axis=1, dtype=np.uint32, out=self._prefix[:, 1:n + 1])
+
+    # --- Views ---
+
+    def column(self, field: str) -> np.ndarray:
+        """Read-only view of one field for the stored frames."""
+        if field == "timestamp":
+            view = self._timestamps[:self._size]
+        else:
+            view = self._scores[SCORE_FIELDS.index(field), :self._size]
+        view = view.view()
+        view.flags.writeable = False
+        return view
+
+    def columns(self) -> dict:
+        return {field: self.column(field) for field in VIDEO_METRIC_FIELDS}
+
+    def mean(self, field: str, default: float = 0.0) -> float:
+        """Average over every frame appended, including ones retention has since merged or dropped."""
+        if not self.total_count:
+            return default
+        return float(self.totals[SCORE_FIELDS.index(field)] / self.total_count)
+
+    def window_means(self, start: float, end: float) -> tuple | None:
+        """
+        (frame count, mean focus, mean confidence) over frames with start <= timestamp < end,
+        or None if there are none. Timestamps are appended in order, so this is two
+        binary searches plus a prefix-sum difference.
+        """
+        timestamps = self._timestamps[:self._size]
+        lo = int(np.searchsorted(timestamps, start, side="left"))
+        hi = int(np.searchsorted(timestamps, end, side="left"))
+        count = hi - lo
+        if count <= 0:
+            return None
+        sums = self._prefix[:, hi].astype(np.float64) - self._prefix[:, lo]
+        return count, float(sums[0] / count), float(sums[1] / count)
+
+    def question_windows(self, question_timestamps: dict) -> list:
+        """
+        [(question_index, frame count, mean focus, mean confidence)] over each question's
+        asked_at..answered_at window (still-open questions run to the latest frame).
+        """
+        windows = []
+        for q, ts in sorted(question_timestamps.items()):
+            if not ts or not ts.get("asked_at"):
+                continue
+            end = ts.get("answered_at") or float("inf")
+            window = self.window_means(ts["asked_at"], end)
+            if window:
+                windows.append((q, *window))
+        return windows
+
+    def segment_means(self, segments: int = 5) -> list:
+        """[(mean focus, mean confidence)] over ~`segments` equal-count slices of the stored frames."""
+        focus = self.column("focus")
+        confidence = self.column("confidence")
+        size = max(1, self._size // segments)
+        return [(float(focus[i:i+size].mean()), float(confidence[i:i+size].mean()))
+                for i in range(0, self._size, size)]
+
+    def tail(self, field: str, count: int) -> list:
+        return self.column(field)[-count:].tolist() if count > 0 else []
+
+    # --- Conversion ---
+
+    def downsampled(self, max_points: int) -> dict:
+        """
+        Column lists cut to at most `max_points` equal-count buckets. Each bucket has
+        the mean of every field plus `<score>_min` / `<score>_max`, so a chart drawn
+        from it keeps the dips and peaks. Fewer frames than that are returned as-is.
+        """
+        n = self._size
+        columns = self.columns()
+        if max_points <= 0 or n <= max_points:
+            return {field: values.tolist() for field, values in columns.items()}
+
+        starts = (np.arange(max_points) * n) // max_points
+        counts = np.diff(np.append(starts, n))
+        result = {"timestamp": (np.add.reduceat(columns["timestamp"], starts) / counts).tolist()}
+        for field in SCORE_FIELDS:
+            values = columns[field]
+            result[field] = np.round(np.add.reduceat(values, starts, dtype=np.float64) / counts, 1).tolist()
+            result[f"{field}_min"] = np.minimum.reduceat(values, starts).tolist()
+            result[f"{field}_max"] = np.maximum.reduceat(values, starts).tolist()
+        return result
+
+    def to_records(self, max_points: int = 0) -> list:
+        """One dict per frame (or per bucket when `max_points` is set), for JSON responses and stored reports."""
+        columns = self.downsampled(max_points)
+        keys = list(columns)
+        return [dict(zip(keys, row)) for row in zip(*columns.values())]
+
+    def to_dict(self) -> dict:
+        """Column lists (the on-disk layout session_store has always used) plus running totals."""
+        data = {field: values.tolist() for field, values in self.columns().items()}
+        data["totals"] = self.totals.tolist()
+        data["total_count"] = self.total_count
+        return data
+
+    @classmethod
+    def from_dict(cls, columns: dict) -> "VideoMetricsStore":
+        store = cls()
+        timestamps = columns.get("timestamp") or []
+        n = len(timestamps)
+        capacity = max(len(store._timestamps), n)
+        store._timestamps = np.empty(capacity, dtype=np.float64)
+        store._scores = np.empty((len(SCORE_FIELDS), capacity), dtype=np.uint8)
+        store._prefix = np.zeros((len(WINDOW_FIELDS), capacity + 1), dtype=np.uint32)
+        store._timestamps[:n] = timestamps
+        for row, field in enumerate(SCORE_FIELDS):
+            store._scores[row, :n] = np.clip(columns.get(field) or [0] * n, 0, 255)
+        store._size = n
+        store._rebuild_prefix()
+        
+        if "totals" in columns:
+            store.totals = np.asarray(columns["totals"], dtype=np.float64)
+            store.total_count = columns.get("total_count", n)
+        else:
+            # Older layout or plain records: derive totals from the columns themselves
+            store.totals = store._scores[:, :n].sum(axis=1, dtype=np.float64)
+            store.total_count = n
+        return store
+
+    @classmethod
+    def from_records(cls, records: list) -> "VideoMetricsStore":
+        return cls.from_dict({field: [m.get(field, 0) for m in records or []] for field in VIDEO_METRIC_FIELDS})
+
+
+def as_metrics_store(metrics) -> VideoMetricsStore:
+    """Accept a live store or a stored report's list of metric dicts."""
+    if isinstance(metrics, VideoMetricsStore):
+        return metrics
+    return VideoMetricsStore.from_records(metrics or [])
@@ -12,8 +12,52 @@ eye_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_eye.xml
 smile_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_smile.xml')
 profile_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_profileface.xml')
 
+# Detect-then-track: full cascade scan every N frames (or on track loss), LK flow in between.
+# VISION_DETECT_INTERVAL=1 scans every frame like before.
+DETECT_INTERVAL = max(1, int(os.getenv("VISION_DETECT_INTERVAL", "5")))
+MIN_TRACK_POINTS = 8  # Fewer surviving flow points than this counts as track loss
+
+# Frame-difference gating: frames whose 32x24 thumbnail differs from the last
+# analyzed one by less than VISION_GATE_THRESHOLD grey levels (mean absolute)
+# reuse its results, at most VISION_GATE_MAX_SKIPS times in a row. 0 disables.
+GATE_THRESHOLD = float(os.getenv("VISION_GATE_THRESHOLD", "1.0"))
+GATE_MAX_SKIPS = int(os.getenv("VISION_GATE_MAX_SKIPS", "3"))
+GATE_THUMB_SIZE = (32, 24)
+
+# Quality/performance profiles, so cascade cost doesn't scale with whatever
+# resolution the browser sends:
+# - detect_width: the face search runs on the frame downscaled to this width
+# - roi_size: the face ROI is resized to this square before eye/smile passes
+# - smile_every: eyes are checked on every analyzed frame, smiles on every k-th
+#   (emotion smoothing at alpha=0.08 would damp per-frame smile results anyway)
+VISION_PROFILES = {
+    "quality": {"detect_width": 640, "roi_size": 200, "smile_every": 2},
+    "balanced": {"detect_width": 480, "roi_size": 160, "smile_every": 3},
+    "performance": {"detect_width": 320, "roi_size": 120, "smile_every": 5},
+}
+VISION_PROFILE = os.getenv("VISION_PROFILE", "balanced")
+
+# How frames are decoded:
+# - "reduced": straight to grayscale, shrunk by 2/4/8 during JPEG decode to the
+#   profile's detect_width (default)
+# - "gray": straight to grayscale at full size
+# - "color": full BGR decode + cvtColor (previous behaviour)
+VISION_DECODE = os.getenv("VISION_DECODE", "reduced")
+REDUCED_GRAYSCALE_FLAGS = {
+    1: cv2.IMREAD_GRAYSCALE,
+    2: cv2.IMREAD_REDUCED_GRAYSCALE_2,
+    4: cv2.IMREAD_REDUCED_GRAYSCALE_4,
+    8: cv2.IMREAD_REDUCED_GRAYSCALE_8,
+}
+
+# Smallest face searched for, as a fraction of frame width (80px / 70px at 640 wide)
+MIN_FACE_FRACTION = 80 / 640
+MIN_PROFILE_FRACTION = 70 / 640
+
 class Stabilizer:
-    def __init__(self):
+    def __init__(self, profile: str | None = None):
+        self.profile = VISION_PROFILES.get(profile or VISION_PROFILE, VISION_PROFILES["balanced"])
+        
         # LK Params for Optical Flow
         self.lk_params = dict(winSize=(21, 21), maxLevel=3,
                               criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 15, 0.01))
@@ -39,55 +83,168 @@ class Stabilizer:
         self.hint_last_changed = time.time()
         self.hint_cooldown = 3.0  # Minimum seconds between hint changes
         
-        # Eye detection history for blink detection
-        self.eyes_history = []  # Store last N detections
+        # Eye detection history for blink detection - fixed ring with a running sum
         self.eyes_history_size = 8  # Increased buffer for better blink differentiation
+        self.eyes_history = [0] * self.eyes_history_size
+        self._eyes_next = 0
+        self._eyes_count = 0
+        self._eyes_sum = 0
         
         # CLAHE for histogram equalization in low-light conditions
         self.clahe = cv2.createCLAHE(clipLimit=2.5, tileGridSize=(8, 8))
+        
+        # Face tracking between full detections
+        self.detect_interval = DETECT_INTERVAL
+        self.track_roi = None  # (x, y, w, h) of the face being followed
+        self.track_kind = None  # "frontal" or "profile"
+        self.frames_since_detect = 0
+        
+        # Decode reduction factor for the next frame, learned from this stream's frame size
+        self.decode_reduction = 1
+        
+        # Reused per-frame buffers: equalized frames alternate between two arrays so
+        # prev_gray can be kept by reference, and the feature mask is cleared in place
+        self._gray_buffers = [None, None]
+        self._gray_index = 0
+        self._mask = None
+        self._mask_roi = None
+        self._roi_buffer = None
+        
+        # Frame-difference gating state
+        self.gate_threshold = GATE_THRESHOLD
+        self.gate_max_skips = GATE_MAX_SKIPS
+        self._thumb = None
+        self._thumb_ref = None  # Thumbnail of the last analyzed frame
+        self.consecutive_skips = 0
+        
+        # Staggered smile detection inside the face ROI
+        self.frontal_frames = 0
+        self.last_smiling = False
+        
+        self.last_targets = None  # (target_focus, target_emotion) of the last analyzed frame
+
+    def equalize(self, gray):
+        """CLAHE into whichever of the two frame buffers is not holding prev_gray."""
+        self._gray_index ^= 1
+        buffer = self._gray_buffers[self._gray_index]
+        if buffer is None or buffer.shape != gray.shape:
+            buffer = self._gray_buffers[self._gray_index] = np.empty_like(gray)
+        return self.clahe.apply(gray, buffer)
 
-    def check_stability(self, gray, face_roi):
+    def resize_roi(self, roi_gray, size: int):
+        """Resize the face ROI into a reused size x size buffer."""
+        if self._roi_buffer is None or self._roi_buffer.shape != (size, size):
+            self._roi_buffer = np.empty((size, size), dtype=np.uint8)
+        interpolation = cv2.INTER_AREA if roi_gray.shape[1] > size else cv2.INTER_LINEAR
+        return cv2.resize(roi_gray, (size, size), dst=self._roi_buffer, interpolation=interpolation)
+
+    def should_skip(self, gray):
         """
-        Returns True if the face is physically steady (ignoring sensor noise).
+        True when this frame is close enough to the last analyzed one to reuse its
+        results, and the consecutive-skip cap hasn't been reached.
         """
-        if self.p0 is None:
-            if face_roi:
-                (x, y, w, h) = face_roi
-                mask = np.zeros_like(gray)
-                mask[y:y+h, x:x+w] = 255
-                self.p0 = cv2.goodFeaturesToTrack(gray, mask=mask, **self.feature_params)
-            self.prev_gray = gray.copy()
+        if self.gate_threshold <= 0:
             return False
+        
+        if self._thumb is None:
+            self._thumb = np.empty((GATE_THUMB_SIZE[1], GATE_THUMB_SIZE[0]), dtype=np.uint8)
+        cv2.resize(gray, GATE_THUMB_SIZE, dst=self._thumb, interpolation=cv2.INTER_AREA)
+        
+        if (self._thumb_ref is not None and self.last_targets is not None
+                and self.consecutive_skips < self.gate_max_skips
+                and cv2.norm(self._thumb, self._thumb_ref, cv2.NORM_L1) / self._thumb.size < self.gate_threshold):
+            self.consecutive_skips += 1
+            return True
+        
+        # This frame gets analyzed and becomes the new reference
+        self._thumb, self._thumb_ref = self._thumb_ref, self._thumb
+        self.consecutive_skips = 0
+        return False
 
-        if self.prev_gray is None: return False
+    def track_flow(self, gray):
+        """
+        Follow the feature points from the previous frame into this one and update
+        steadiness. Returns the median (dx, dy) of the face points, or None if
+        tracking was lost.
+        """
+        if self.p0 is None or self.prev_gray is None:
+            return None
+        if self.prev_gray.shape != gray.shape:
+            # Frame size changed (camera switch or new decode reduction): start over
+            self.p0 = None
+            self.track_roi = None
+            return None
 
         # Calculate Flow
         p1, st, err = cv2.calcOpticalFlowPyrLK(self.prev_gray, gray, self.p0, None, **self.lk_params)
         
         steady = False
+        shift = None
         if p1 is not None and len(p1) > 5:
             # Calculate average movement magnitude
             good_new = p1[st==1]
             good_old = self.p0[st==1]
             
-            dists = []
-            for new, old in zip(good_new, good_old):
-                dist = np.linalg.norm(new - old)
-                dists.append(dist)
-            
-            avg_dist = np.mean(dists) if dists else 0
+            moves = good_new - good_old
+            avg_dist = np.hypot(moves[:, 0], moves[:, 1]).mean() if len(moves) else 0
             
             # Threshold: If avg movement < 0.6 pixels, we are "Rock Steady"
             if avg_dist < 0.6:
                 steady = True
             
+            if len(good_new) >= MIN_TRACK_POINTS:
+                # Median is robust to the odd point that slid onto the background
+                shift = np.median(moves, axis=0)
             self.p0 = good_new.reshape(-1, 1, 2)
         else:
             self.p0 = None # Re-init next frame
             
-        self.prev_gray = gray.copy()
         self.is_steady = steady
-        return steady
+        return shift
+
+    def update_features(self, gray, face_roi, reseed=False):
+        """
+        Keep this frame for the next flow step; (re)pick feature points inside the face.
+        `gray` is kept by reference, so it must not be modified afterwards.
+        """
+        if face_roi and (self.p0 is None or reseed):
+            (x, y, w, h) = face_roi
+            if self._mask is None or self._mask.shape != gray.shape:
+                self._mask = np.zeros_like(gray)
+            elif self._mask_roi is not None:
+                # Only the previous face rectangle is non-zero
+                (px, py, pw, ph) = self._mask_roi
+                self._mask[py:py+ph, px:px+pw] = 0
+            self._mask[y:y+h, x:x+w] = 255
+            self._mask_roi = (x, y, w, h)
+            self.p0 = cv2.goodFeaturesToTrack(gray, mask=self._mask, **self.feature_params)
+        # No copy: `gray` lives in one of the two equalize() buffers, which isn't
+        # overwritten until the frame after next
+        self.prev_gray = gray
+
+    def follow_face(self, shift, frame_shape):
+        """
+        Move the tracked ROI by the flow shift. Returns the new ROI, or None when a
+        full detection is due (interval elapsed, flow lost, or face left the frame).
+        """
+        self.frames_since_detect += 1
+        if self.track_roi is None or shift is None or self.frames_since_detect >= self.detect_interval:
+            return None
+        
+        (x, y, w, h) = self.track_roi
+        x = int(round(x + shift[0]))
+        y = int(round(y + shift[1]))
+        frame_h, frame_w = frame_shape[:2]
+        if x < 0 or y < 0 or x + w > frame_w or y + h > frame_h:
+            return None
+        
+        self.track_roi = (x, y, w, h)
+        return self.track_roi
+
+    def start_track(self, face_roi, kind):
+        self.track_roi = tuple(int(v) for v in face_roi) if face_roi is not None else None
+        self.track_kind = kind if face_roi is not None else None
+        self.frames_since_detect = 0
 
     def smooth(self, current_val, target_val, alpha=0.15):
         """
@@ -118,15 +275,16 @@ class Stabilizer:
     
     def update_eyes_history(self, num_eyes):
         """Track eye detection history for blink vs closed eyes differentiation"""
-        self.eyes_history.append(num_eyes)
-        if len(self.eyes_history) > self.eyes_history_size:
-            self.eyes_history.pop(0)
+        self._eyes_sum += num_eyes - self.eyes_history[self._eyes_next]
+        self.eyes_history[self._eyes_next] = num_eyes
+        self._eyes_next = (self._eyes_next + 1) % self.eyes_history_size
+        self._eyes_count = min(self._eyes_count + 1, self.eyes_history_size)
     
     def get_average_eyes(self):
         """Get average number of eyes detected recently"""
-        if not self.eyes_history:
+        if not self._eyes_count:
             return 0
-        return sum(self.eyes_history) / len(self.eyes_history)
+        return self._eyes_sum / self._eyes_count
     
     def update_hint(self, focus, emotion, confidence):
         """
@@ -163,81 +321,162 @@ class Stabilizer:
         return self.current_hint
 
 
-# Helper to process a base64 image
-def process_video_frame(base64_image, stabilizer: Stabilizer):
-    try:
-        # Decode base64 image
-        if ',' in base64_image:
-            base64_image = base64_image.split(',')[1]
+def decode_frame(frame_data, flags=cv2.IMREAD_COLOR):
+    """
+    Decode one webcam frame.
+    Accepts raw JPEG/WebP bytes (binary websocket message) or a base64 data URL
+    (legacy text message). Binary input is wrapped in place via a memoryview,
+    so the only allocation is the decoded image itself.
+    """
+    if isinstance(frame_data, str):
+        # Legacy path: strip the data-URL prefix and base64-decode
+        comma = frame_data.find(',')
+        frame_data = base64.b64decode(frame_data[comma + 1:] if comma != -1 else frame_data)
+    
+    nparr = np.frombuffer(memoryview(frame_data), dtype=np.uint8)
+    return cv2.imdecode(nparr, flags)
+
+
+def detect_face(gray, detect_width: int = 640):
+    """
+    Full-frame cascade scan on a copy downscaled to `detect_width`. Returns
+    (face_roi, kind) in `gray` coordinates with kind "frontal" or "profile",
+    or (None, None) when no face is found.
+    """
+    scale = min(1.0, detect_width / gray.shape[1])
+    small = gray if scale == 1.0 else cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    width = small.shape[1]
+    
+    def to_full(roi):
+        return tuple(int(round(v / scale)) for v in roi)
+    
+    # Detection - Ultra-Stable Parameters
+    # High minNeighbors to eliminate almost all false positive flicker
+    min_face = max(24, int(width * MIN_FACE_FRACTION))
+    faces = face_cascade.detectMultiScale(small, scaleFactor=1.1, minNeighbors=7, minSize=(min_face, min_face))
+    if len(faces) > 0:
+        # Pick the largest face (most likely the primary subject)
+        faces = sorted(faces, key=lambda f: f[2]*f[3], reverse=True)
+        return to_full(faces[0]), "frontal"
+    
+    min_profile = max(20, int(width * MIN_PROFILE_FRACTION))
+    profiles = profile_cascade.detectMultiScale(small, scaleFactor=1.1, minNeighbors=6, minSize=(min_profile, min_profile))
+    if len(profiles) > 0:
+        return to_full(profiles[0]), "profile"
+    return None, None
+
+
+def decode_gray(frame_data, stabilizer: Stabilizer):
+    """
+    Decode a frame as grayscale according to VISION_DECODE. In "reduced" mode the
+    stream's full width is remembered so later frames decode at the largest 2/4/8
+    reduction that still covers the profile's detect_width.
+    """
+    if VISION_DECODE == "color":
+        frame = decode_frame(frame_data)
+        return None if frame is None else cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    
+    if VISION_DECODE != "reduced":
+        return decode_frame(frame_data, cv2.IMREAD_GRAYSCALE)
+    
+    reduction = stabilizer.decode_reduction
+    gray = decode_frame(frame_data, REDUCED_GRAYSCALE_FLAGS[reduction])
+    if gray is not None:
+        full_width = gray.shape[1] * reduction
+        detect_width = stabilizer.profile["detect_width"]
+        stabilizer.decode_reduction = max(r for r in REDUCED_GRAYSCALE_FLAGS if r == 1 or full_width // r >= detect_width)
+    return gray
+
+
+def analyze_face(gray, stabilizer: Stabilizer):
+    """Locate the face and score it. Returns (target_focus, target_emotion)."""
+    # Apply CLAHE for better contrast normalization (helps in low-light)
+    gray = stabilizer.equalize(gray)
+    
+    # 1. Locate the face: follow last frame's ROI with optical flow while it
+    # holds, otherwise run a full cascade scan
+    shift = stabilizer.track_flow(gray)
+    face_roi = stabilizer.follow_face(shift, gray.shape)
+    face_kind = stabilizer.track_kind
+    detected = face_roi is None
+    if detected:
+        face_roi, face_kind = detect_face(gray, stabilizer.profile["detect_width"])
+        stabilizer.start_track(face_roi, face_kind)
+    
+    target_focus = 0.0
+    target_emo = 0.0
+    num_eyes = 0
+    
+    if face_kind == "frontal":
+        (x, y, w, h) = face_roi
+        roi_gray = gray[y:y+h, x:x+w]
         
-        image_bytes = base64.b64decode(base64_image)
-        nparr = np.frombuffer(image_bytes, np.uint8)
-        frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+        # Normalize the face to a fixed size so eye/smile cost is independent of
+        # how close the candidate sits to a high-resolution camera
+        roi_size = stabilizer.profile["roi_size"]
+        roi_gray = stabilizer.resize_roi(roi_gray, roi_size)
         
-        if frame is None:
-            return None
-
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        
-        # Apply CLAHE for better contrast normalization (helps in low-light)
-        gray = stabilizer.clahe.apply(gray)
-        
-        # 1. Detection - Ultra-Stable Parameters
-        # High minNeighbors to eliminate almost all false positive flicker
-        faces = face_cascade.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=7, minSize=(80, 80))
-        profiles = profile_cascade.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=6, minSize=(70, 70)) if len(faces) == 0 else []
-        
-        target_focus = 0.0
-        target_emo = 0.0
-        face_roi = None
-        num_eyes = 0
-        
-        if len(faces) > 0:
-            # Pick the largest face (most likely the primary subject)
-            faces = sorted(faces, key=lambda f: f[2]*f[3], reverse=True)
-            (x, y, w, h) = faces[0]
-            face_roi = (x, y, w, h)
-            roi_gray = gray[y:y+h, x:x+w]
-            
-            # Eyes detection - Strict
-            roi_gray = stabilizer.clahe.apply(roi_gray)
-            eyes = eye_cascade.detectMultiScale(roi_gray, scaleFactor=1.1, minNeighbors=6, minSize=(20, 20))
-            num_eyes = len(eyes)
-            stabilizer.update_eyes_history(num_eyes)
-            avg_eyes = stabilizer.get_average_eyes()
-            
-            # Focus score based on eye detection - Harder thresholds for "90+" scores
-            if avg_eyes >= 1.95:  # Perfectly steady eye contact
-                target_focus = 98.0
-            elif avg_eyes >= 1.5:  # Good eye contact
-                target_focus = 85.0
-            elif avg_eyes >= 1.0:  # Fair contact
-                target_focus = 60.0
-            elif avg_eyes >= 0.3:  # Frequent blinking or looking away
-                target_focus = 35.0
-            else:  # Eyes closed or looking down
-                target_focus = 10.0
-            
-            # Smile detection - Very Strict
+        # Eyes detection - Strict (ROI is already CLAHE-equalized with the frame)
+        eyes = eye_cascade.detectMultiScale(roi_gray, scaleFactor=1.1, minNeighbors=6, minSize=(20, 20))
+        num_eyes = len(eyes)
+        stabilizer.update_eyes_history(num_eyes)
+        avg_eyes = stabilizer.get_average_eyes()
+        
+        # Focus score based on eye detection - Harder thresholds for "90+" scores
+        if avg_eyes >= 1.95:  # Perfectly steady eye contact
+            target_focus = 98.0
+        elif avg_eyes >= 1.5:  # Good eye contact
+            target_focus = 85.0
+        elif avg_eyes >= 1.0:  # Fair contact
+            target_focus = 60.0
+        elif avg_eyes >= 0.3:  # Frequent blinking or looking away
+            target_focus = 35.0
+        else:  # Eyes closed or looking down
+            target_focus = 10.0
+        
+        # Smile detection - Very Strict, every `smile_every` frontal frames
+        if stabilizer.frontal_frames % stabilizer.profile["smile_every"] == 0:
             smiles = smile_cascade.detectMultiScale(roi_gray, scaleFactor=1.2, minNeighbors=25, minSize=(30, 30))
-            if len(smiles) > 0: 
-                target_emo = 90.0
-            else: 
-                target_emo = 40.0  # Neutral baseline
-            
-        elif len(profiles) > 0:
-            target_focus = 20.0  # Profile view = low focus
-            target_emo = 30.0
-            (x,y,w,h) = profiles[0]
-            face_roi = (x,y,w,h)
-            stabilizer.update_eyes_history(0)
-        else:
-            target_focus = 5.0  # No face detected
-            target_emo = 5.0
-            stabilizer.update_eyes_history(0)
+            stabilizer.last_smiling = len(smiles) > 0
+        stabilizer.frontal_frames += 1
+        if stabilizer.last_smiling: 
+            target_emo = 90.0
+        else: 
+            target_emo = 40.0  # Neutral baseline
+        
+    elif face_kind == "profile":
+        target_focus = 20.0  # Profile view = low focus
+        target_emo = 30.0
+        stabilizer.update_eyes_history(0)
+    else:
+        target_focus = 5.0  # No face detected
+        target_emo = 5.0
+        stabilizer.update_eyes_history(0)
 
-        # 2. Stability Check (Optical Flow)
-        stabilizer.check_stability(gray, face_roi)
+    # 2. Stability Check (Optical Flow) - steadiness came from track_flow above;
+    # a fresh detection re-seeds the flow points on the face
+    stabilizer.update_features(gray, face_roi, reseed=detected)
+    
+    
+    return target_focus, target_emo
+
+
+# Helper to process a frame (raw bytes or base64 string)
+def process_video_frame(frame_data, stabilizer: Stabilizer):
+    try:
+        gray = decode_gray(frame_data, stabilizer)
+        
+        if gray is None:
+            return None
+        
+        # 0. Frame-difference gate: on a near-identical frame reuse the last
+        # detection results and only advance the smoothing below
+        gated = stabilizer.should_skip(gray)
+        if gated:
+            target_focus, target_emo = stabilizer.last_targets
+        else:
+            target_focus, target_emo = analyze_face(gray, stabilizer)
+            stabilizer.last_targets = (target_focus, target_emo)
         
         # 3. Smooth with tuned response curves - VERY STABLE (Low Alpha)
         stabilizer.internal_focus = stabilizer.smooth(stabilizer.internal_focus, target_focus, alpha=0.1)
@@ -271,7 +510,8 @@ def process_video_frame(base64_image, stabilizer: Stabilizer):
             "confidence": int(stabilizer.confidence_score),
             "stress": int(stress),
             "hint": hint,
-            "is_steady": stabilizer.is_steady
+            "is_steady": stabilizer.is_steady,
+            "gated": gated
         }
 
     except Exception as e:
@@ -0,0 +1,229 @@
+"""
+Vision Executor
+
+Runs `process_video_frame` outside the event loop so Haar cascades and
+optical flow never stall /ws/interview:
+- One single-process pool per shard; a video stream is pinned to a shard by
+  hashing its key, so its Stabilizer state always lives in the same process
+- Bounded work: at most `max_pending_per_stream` frames in flight per stream
+  and `max_pending_per_worker` per shard; anything beyond is dropped
+- VISION_WORKERS=0 keeps the old inline behaviour (handy on Windows/dev)
+- LatestFrameSlot + FrameRateMeter back /ws/video's latest-frame-wins mode
+"""
+
+import asyncio
+import multiprocessing
+import os
+import time
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# Lives inside each worker process: {stream_key: Stabilizer}
+_worker_stabilizers = {}
+
+
+def _process_in_worker(stream_key: str, frame_data):
+    from services.video_service import Stabilizer, process_video_frame
+    stabilizer = _worker_stabilizers.get(stream_key)
+    if stabilizer is None:
+        stabilizer = _worker_stabilizers[stream_key] = Stabilizer()
+    return process_video_frame(frame_data, stabilizer)
+
+
+def _release_in_worker(stream_key: str):
+    _worker_stabilizers.pop(stream_key, None)
+
+
+class VisionExecutor:
+    def __init__(self, workers: int = 2, max_pending_per_stream: int = 2, max_pending_per_worker: int = 8):
+        self.workers = workers
+        self.max_pending_per_stream = max_pending_per_stream
+        self.max_pending_per_worker = max_pending_per_worker
+        self._shards = []
+        self._shard_pending = []
+        self._stream_pending = {}
+        self._inline_stabilizers = {}
+        self.processed = 0
+        self.dropped = 0
+        self.gated = 0  # Frames answered from the frame-difference gate
+        self.restarts = 0
+
+    def start(self):
+        if self.workers <= 0 or self._shards:
+            return
+        # Spawn (not fork) so workers don't inherit the server's event loop and threads
+        context = multiprocessing.get_context("spawn")
+        self._shards = [ProcessPoolExecutor(max_workers=1, mp_context=context) for _ in range(self.workers)]
+        self._shard_pending = [0] * self.workers
+        print(f"[Vision] Started {self.workers} vision worker processes")
+
+    def shutdown(self):
+        for shard in self._shards:
+            shard.shutdown(wait=False, cancel_futures=True)
+        self._shards = []
+
+    def _shard_index(self, stream_key: str) -> int:
+        # crc32 rather than hash(): stable across interpreter runs
+        return zlib.crc32(stream_key.encode()) % len(self._shards)
+
+    async def process(self, stream_key: str, frame_data) -> dict | None:
+        """
+        Analyze one frame for a stream. Returns None when the frame could not be
+        decoded or was dropped because the stream or its worker is saturated.
+        """
+        if not self._shards:
+            return self._process_inline(stream_key, frame_data)
+
+        idx = self._shard_index(stream_key)
+        if (self._stream_pending.get(stream_key, 0) >= self.max_pending_per_stream
+                or self._shard_pending[idx] >= self.max_pending_per_worker):
+            self.dropped += 1
+            return None
+
+        if isinstance(frame_data, memoryview):
+            frame_data = frame_data.tobytes()  # Must be picklable to cross the process boundary
+
+        self._stream_pending[stream_key] = self._stream_pending.get(stream_key, 0) + 1
+        self._shard_pending[idx] += 1
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._shards[idx], _process_in_worker, stream_key, frame_data)
+            return self._count(result)
+        except BrokenProcessPool:
+            self._restart_shard(idx)
+            return None
+        finally:
+            self._shard_pending[idx] -= 1
+            remaining = self._stream_pending.get(stream_key, 1) - 1
+            if remaining > 0:
+                self._stream_pending[stream_key] = remaining
+            else:
+                self._stream_pending.pop(stream_key, None)
+
+    def _process_inline(self, stream_key: str, frame_data) -> dict | None:
+        from services.video_service import Stabilizer, process_video_frame
+        stabilizer = self._inline_stabilizers.get(stream_key)
+        if stabilizer is None:
+            stabilizer = self._inline_stabilizers[stream_key] = Stabilizer()
+        return self._count(process_video_frame(frame_data, stabilizer))
+
+    def _count(self, result: dict | None) -> dict | None:
+        if result is None:
+            return None
+        self.processed += 1
+        if result.pop("gated", False):
+            self.gated += 1
+        return result
+
+    def _restart_shard(self, idx: int):
+        """A worker died (e.g. OOM); replace it. Its streams start with fresh Stabilizers."""
+        print(f"[Vision] Worker {idx} died, restarting")
+        self.restarts += 1
+        self._shards[idx].shutdown(wait=False, cancel_futures=True)
+        self._shards[idx] = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+
+    async def release(self, stream_key: str):
+        """Drop a finished stream's Stabilizer state."""
+        self._stream_pending.pop(stream_key, None)
+        if not self._shards:
+            self._inline_stabilizers.pop(stream_key, None)
+            return
+        try:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self._shards[self._shard_index(stream_key)], _release_in_worker, stream_key)
+        except Exception as e:
+            print(f"[Vision] Release failed for {stream_key}: {e}")
+
+    def stats(self) -> dict:
+        return {
+            "workers": len(self._shards),
+            "pending": sum(self._shard_pending),
+            "processed": self.processed,
+            "dropped": self.dropped,
+            "gate_hit_rate": round(self.gated / self.processed, 3) if self.processed else 0.0,
+            "restarts": self.restarts
+        }
+
+
+class LatestFrameSlot:
+    """
+    Single-frame mailbox between a socket reader and the analysis loop.
+    Putting a frame overwrites any frame not yet taken; the overwritten one
+    is counted as dropped.
+    """
+
+    def __init__(self):
+        self._frame = None
+        self._ready = asyncio.Event()
+        self.closed = False
+        self.dropped = 0
+
+    def put(self, frame_data):
+        if self._frame is not None:
+            self.dropped += 1
+        self._frame = frame_data
+        self._ready.set()
+
+    def close(self):
+        self.closed = True
+        self._ready.set()
+
+    async def take(self):
+        """Wait for the freshest frame. Returns None once closed and empty."""
+        while self._frame is None and not self.closed:
+            self._ready.clear()
+            await self._ready.wait()
+        frame_data, self._frame = self._frame, None
+        return frame_data
+
+
+class FrameRateMeter:
+    """
+    Processed, dropped (superseded before analysis) and empty (analyzed but no
+    result) frames per second over a sliding window. Until a full window has
+    passed, rates are over the time observed so far.
+    """
+
+    def __init__(self, window_seconds: float = 5.0):
+        self.window_seconds = window_seconds
+        self._started = None  # First record()
+        self._processed = deque()
+        self._dropped = deque()
+        self._empty = deque()
+
+    def record(self, processed: int = 0, dropped: int = 0, empty: int = 0):
+        now = time.monotonic()
+        if self._started is None:
+            self._started = now
+        self._processed.extend([now] * processed)
+        self._dropped.extend([now] * dropped)
+        self._empty.extend([now] * empty)
+
+    def observed_seconds(self) -> float:
+        return time.monotonic() - self._started if self._started is not None else 0.0
+
+    def has_full_window(self) -> bool:
+        return self.observed_seconds() >= self.window_seconds
+
+    def _rate(self, stamps: deque, now: float, span: float) -> float:
+        while stamps and now - stamps[0] > self.window_seconds:
+            stamps.popleft()
+        return round(len(stamps) / span, 1)
+
+    def rates(self) -> dict:
+        now = time.monotonic()
+        # At least a second, so the first few frames don't read as hundreds per second
+        span = min(self.window_seconds, max(self.observed_seconds(), 1.0))
+        return {"processed_fps": self._rate(self._processed, now, span),
+                "dropped_fps": self._rate(self._dropped, now, span),
+                "empty_fps": self._rate(self._empty, now, span)}
+
+
+def create_vision_executor() -> VisionExecutor:
+    return VisionExecutor(
+        workers=int(os.getenv("VISION_WORKERS", "2")),
+        max_pending_per_stream=int(os.getenv("VISION_MAX_PENDING_PER_STREAM", "2")),
+        max_pending_per_worker=int(os.getenv("VISION_MAX_PENDING_PER_WORKER", "8"))
+    )
@@ -3,7 +3,7 @@ import { AuthProvider, useAuth } from './context/AuthContext';
 import { Layout } from './components/Layout/Layout';
 import { LoginModal } from './components/Auth/LoginModal';
 import { BrowserRouter, Routes, Route, useLocation, useNavigate } from 'react-router-dom';
-import { API_ENDPOINTS } from './config/api';
+import { API_ENDPOINTS, getSessionId } from './config/api';
 import { useState, useEffect } from 'react';
 import Lenis from '@studio-freight/lenis';
 import gsap from 'gsap';
@@ -69,7 +69,7 @@ const AppLayout = ({ children }: { children: React.ReactNode }) => {
         await fetch(`${API_ENDPOINTS.analytics}/../session/save`, {
           method: 'POST',
           headers: { 'Content-Type': 'application/json' },
-          body: JSON.stringify({ user_id: user.id })
+          body: JSON.stringify({ user_id: user.id, session_id: getSessionId() })
         });
       }
     } catch (error) {
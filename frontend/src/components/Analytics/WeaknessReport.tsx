@@ -1,7 +1,7 @@
 import React, { useEffect, useState } from 'react';
 import { motion } from 'framer-motion';
 import { TrendingUp, TrendingDown, AlertTriangle, Shield, Target, Clock, Lightbulb, Bug } from 'lucide-react';
-import { API_ENDPOINTS } from '../../config/api';
+import { API_ENDPOINTS, withSession } from '../../config/api';
 
 interface TopicScore {
     topic: string;
@@ -39,7 +39,7 @@ export const WeaknessReport: React.FC = () => {
     useEffect(() => {
         const fetchData = async () => {
             try {
-                const res = await fetch(`${API_ENDPOINTS.uploadResume.replace('/upload-resume', '')}/api/session/weakness-analysis`);
+                const res = await fetch(withSession(`${API_ENDPOINTS.uploadResume.replace('/upload-resume', '')}/api/session/weakness-analysis`));
                 if (res.ok) {
                     setData(await res.json());
                 }
@@ -2,7 +2,7 @@ import { useState, useEffect, useRef } from 'react';
 import { Send, Mic, MicOff } from 'lucide-react';
 import { motion, AnimatePresence } from 'framer-motion';
 import { AudioPlayer } from './AudioPlayer';
-import { API_ENDPOINTS, WS_ENDPOINTS } from '../../config/api';
+import { API_ENDPOINTS, WS_ENDPOINTS, withSession } from '../../config/api';
 
 interface Message {
   role: 'ai' | 'user';
@@ -37,7 +37,7 @@ export function ChatBox({ onAISpeakingChange, onUserSpeakingChange, onLogicFeedb
   }, [messages, isTranscribing]);
 
   useEffect(() => {
-    const ws = new WebSocket(WS_ENDPOINTS.interview);
+    const ws = new WebSocket(withSession(WS_ENDPOINTS.interview));
     socketRef.current = ws;
 
     ws.onopen = () => {
@@ -58,6 +58,10 @@ export function ChatBox({ onAISpeakingChange, onUserSpeakingChange, onLogicFeedb
             const speakDuration = Math.max(3000, (data.text.length / 50) * 3000);
             setTimeout(() => onAISpeakingChange?.(false), speakDuration);
           }
+        } else if (data.type === 'user_transcript') {
+          // Transcript of a recording sent as `user_audio`
+          if (data.text) setMessages(prev => [...prev, { role: 'user', text: data.text }]);
+          setIsTranscribing(false);
         } else if (data.type === 'logic_feedback') {
           // Feature 2: Forward logic feedback to parent
           onLogicFeedback?.({
@@ -127,6 +131,14 @@ export function ChatBox({ onAISpeakingChange, onUserSpeakingChange, onLogicFeedb
 
   const sendVoice = async (blob: Blob, duration: number = 0) => {
     setIsTranscribing(true);
+    const socket = socketRef.current;
+    if (socket?.readyState === WebSocket.OPEN) {
+      // Send the recording on the socket: the server transcribes it and answers
+      // directly, skipping the /transcribe round trip
+      socket.send(JSON.stringify({ type: 'user_audio', duration: duration, mime_type: blob.type }));
+      socket.send(blob);
+      return;
+    }
     const formData = new FormData();
     formData.append('file', blob);
 
@@ -143,7 +155,8 @@ export function ChatBox({ onAISpeakingChange, onUserSpeakingChange, onLogicFeedb
           type: 'user_turn',
           text: data.text,
           duration: duration,       // Feature 4: speech duration
-          silence_duration: 0       // Could be tracked via VAD in future
+          silence_duration: 0,      // Fallback when the server has no VAD result
+          upload_id: data.upload_id // Server-side VAD timing for this recording
         }));
       }
     } catch (error) {
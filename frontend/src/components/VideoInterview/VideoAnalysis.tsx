@@ -2,7 +2,7 @@ import React, { useState, useRef, useCallback } from 'react';
 import { Activity, Smile, Brain, Hand, Sparkles } from 'lucide-react';
 import { motion, AnimatePresence } from 'framer-motion';
 import Webcam from 'react-webcam';
-import { WS_ENDPOINTS } from '../../config/api';
+import { WS_ENDPOINTS, withSession } from '../../config/api';
 import { AIAssistanceBadge } from '../AIAssistanceBadge';
 
 interface VideoAnalysisProps {
@@ -60,7 +60,7 @@ export const VideoAnalysis: React.FC<VideoAnalysisProps> = ({
     React.useEffect(() => {
         if (onReady) onReady();
 
-        const ws = new WebSocket(WS_ENDPOINTS.video);
+        const ws = new WebSocket(withSession(WS_ENDPOINTS.video));
         wsRef.current = ws;
 
         ws.onopen = () => {
@@ -33,4 +33,19 @@ export const WS_ENDPOINTS = {
   video: `${WS_BASE_URL}/ws/video`,
 };
 
+// Interview session id returned by /upload-resume and /start-topic-interview.
+// Every later call names it, so concurrent candidates never share a session.
+const SESSION_STORAGE_KEY = 'hirebyte_session_id';
+
+export const setSessionId = (sessionId: string) => sessionStorage.setItem(SESSION_STORAGE_KEY, sessionId);
+
+export const getSessionId = (): string | null => sessionStorage.getItem(SESSION_STORAGE_KEY);
+
+// Append ?session_id=... to an HTTP or WebSocket URL
+export const withSession = (url: string): string => {
+  const sessionId = getSessionId();
+  if (!sessionId) return url;
+  return `${url}${url.includes('?') ? '&' : '?'}session_id=${encodeURIComponent(sessionId)}`;
+};
+
 export default API_BASE_URL;
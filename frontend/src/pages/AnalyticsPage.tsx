@@ -1,7 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { useNavigate, useSearchParams } from 'react-router-dom';
 import { CandidateReport } from '../components/Analytics/CandidateReport';
-import { API_ENDPOINTS } from '../config/api';
+import { API_ENDPOINTS, withSession } from '../config/api';
 import { ArrowLeft } from 'lucide-react';
 
 export const AnalyticsPage: React.FC = () => {
@@ -22,14 +22,12 @@ export const AnalyticsPage: React.FC = () => {
         }
     }, [searchParams]);
 
-    const handleViewReport = async (id: string) => {
+    const handleViewReport = async (_id: string) => {
         setLoading(true);
         try {
             // Fetch analytics (current session only essentially, or direct ID if we kept that valid)
             // Since history is gone, this is mostly for the immediate post-interview redirect
-            const endpoint = id === 'current' || !id
-                ? `${API_ENDPOINTS.analytics}`
-                : `${API_ENDPOINTS.analytics}`; // Fallback to current session always since history endpoints are gone
+            const endpoint = withSession(API_ENDPOINTS.analytics); // Current session only since history endpoints are gone
 
             const res = await fetch(endpoint);
             if (res.ok) {
@@ -7,7 +7,7 @@ import { HintLevelButtons, HintLevel } from '../components/HintLevelButtons';
 import { LogicFeedback } from '../components/Interview/LogicFeedback';
 import { SpeechFeedback } from '../components/Interview/SpeechFeedback';
 import { Sparkles, Lightbulb } from 'lucide-react';
-import { API_ENDPOINTS } from '../config/api';
+import { API_ENDPOINTS, getSessionId } from '../config/api';
 import { useAuth } from '../context/AuthContext';
 
 export const InterviewPage: React.FC = () => {
@@ -47,7 +47,7 @@ export const InterviewPage: React.FC = () => {
             const response = await fetch(API_ENDPOINTS.getHint, {
                 method: 'POST',
                 headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ question: prompt, level })
+                body: JSON.stringify({ question: prompt, level, session_id: getSessionId() })
             });
 
             if (response.ok) {
@@ -2,7 +2,7 @@ import React, { useState } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { FileUpload } from '../components/FileUpload';
 import { Loader2, ArrowRight, Brain, Code, Globe, Sparkles } from 'lucide-react';
-import { API_ENDPOINTS } from '../config/api';
+import { API_ENDPOINTS, setSessionId } from '../config/api';
 import { ConsentModal } from '../components/ConsentModal';
 
 type InterviewMode = 'resume' | 'topic';
@@ -63,6 +63,7 @@ export const SetupPage: React.FC = () => {
                 });
 
                 if (!response.ok) throw new Error("Backend upload failed");
+                setSessionId((await response.json()).session_id);
 
                 navigate('/interview', {
                     state: {
@@ -83,6 +84,7 @@ export const SetupPage: React.FC = () => {
                 });
 
                 if (!response.ok) throw new Error("Backend topic setup failed");
+                setSessionId((await response.json()).session_id);
 
                 navigate('/interview', {
                     state: {